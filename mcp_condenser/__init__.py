@@ -4,6 +4,7 @@ from mcp_condenser.condenser import (
     condense_json,  # deprecated
     condense_text,
     count_tokens,
+    count_tokens_batch,
     stats,
     toon_encode,
     toon_encode_json,  # deprecated
@@ -11,7 +12,9 @@ from mcp_condenser.condenser import (
 )
 from mcp_condenser.parsers import (
     PARSER_REGISTRY,
+    InputFormat,
     Parser,
+    is_plain_text,
     parse_input,
     register_parser,
 )
@@ -22,9 +25,12 @@ __all__ = [
     "condense_json",  # deprecated
     "toon_encode_json",  # deprecated
     "parse_input",
+    "is_plain_text",
     "count_tokens",
+    "count_tokens_batch",
     "stats",
     "truncate_to_token_limit",
+    "InputFormat",
     "Parser",
     "PARSER_REGISTRY",
     "register_parser",
@@ -15,9 +15,10 @@ Usage:
 """
 
 import json, math, sys, re, argparse, warnings
+from functools import lru_cache
 from dataclasses import dataclass
-from typing import Any
-from collections import OrderedDict, defaultdict
+from typing import Any, NamedTuple
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime, timezone
 
 import toon_format
@@ -64,12 +65,51 @@ def resolve_profile(name: str = "balanced", **overrides) -> Heuristics:
 try:
     import tiktoken
     _enc = tiktoken.get_encoding("cl100k_base")
+
+    # Short strings (error messages, truncation notices) recur across calls;
+    # memoize those by content.  Long payloads are never cached.
+    _SHORT_TEXT_CHARS = 256
+
+    # encode_ordinary() treats special-token text such as "<|endoftext|>"
+    # as plain text (encode() raises on it) and skips the special-token scan.
+    @lru_cache(maxsize=1024)
+    def _count_short(text: str) -> int:
+        return len(_enc.encode_ordinary(text))
+
     def count_tokens(text: str) -> int:
-        return len(_enc.encode(text))
+        if len(text) <= _SHORT_TEXT_CHARS:
+            return _count_short(text)
+        return len(_enc.encode_ordinary(text))
+
+    def count_tokens_batch(texts: list[str]) -> list[int]:
+        """Count tokens for several texts in one (thread-parallel) encode call."""
+        return [len(toks) for toks in _enc.encode_ordinary_batch(texts)]
+
+    def _token_prefix(text: str, max_tokens: int) -> tuple[str, int]:
+        """Return the longest token prefix of *text* within *max_tokens*, and its count.
+
+        Encodes once and decodes a slice of the ids.  Re-tokenizing a cut
+        can differ slightly at the boundary, so the prefix is re-counted and
+        shortened a token at a time until it fits.
+        """
+        ids = _enc.encode_ordinary(text)
+        n = min(max_tokens, len(ids))
+        while True:
+            # Drop a multi-byte character split by the cut instead of emitting U+FFFD
+            prefix = _enc.decode_bytes(ids[:n]).decode("utf-8", errors="ignore")
+            tokens = count_tokens(prefix)
+            if tokens <= max_tokens or n == 0:
+                return prefix, tokens
+            n -= 1
     TOKEN_METHOD = "tiktoken/cl100k_base"
 except Exception:
     def count_tokens(text: str) -> int:
         return len(text) // 4
+    def count_tokens_batch(texts: list[str]) -> list[int]:
+        return [len(t) // 4 for t in texts]
+    def _token_prefix(text: str, max_tokens: int) -> tuple[str, int]:
+        prefix = text[:max_tokens * 4 + 3]
+        return prefix, len(prefix) // 4
     TOKEN_METHOD = "len/4 estimate"
 
 
@@ -85,15 +125,24 @@ def classify(val: Any) -> str:
     return "unknown"
 
 
-def flatten(obj: dict, pfx: str = "") -> OrderedDict:
-    """Flatten nested dict into dot-notation keys. Arrays kept as-is."""
-    out = OrderedDict()
-    for k, v in obj.items():
-        key = f"{pfx}.{k}" if pfx else k
-        if isinstance(v, dict):
-            out.update(flatten(v, key))
-        else:
+def flatten(obj: dict, pfx: str = "") -> dict:
+    """Flatten nested dict into dot-notation keys. Arrays kept as-is.
+
+    Walks depth-first with a stack of item iterators, so keys come out in
+    the same order as a recursive walk without Python's recursion limit.
+    """
+    out = {}
+    stack = [(pfx, iter(obj.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            key = f"{prefix}.{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((key, iter(v.items())))
+                break
             out[key] = v
+        else:
+            stack.pop()
     return out
 
 
@@ -124,15 +173,14 @@ def is_homogeneous_array(arr: list) -> bool:
         return False
     if len(arr) < 2:
         return False  # single-item arrays render as objects
-    union = set()
-    for item in arr:
-        union.update(k for k, v in flatten(item).items() if not isinstance(v, list))
-    if len(union) < 2:
+    # Flatten each item once; a key's count is the number of items with it
+    key_counts = Counter(
+        k for item in arr for k, v in flatten(item).items() if not isinstance(v, list)
+    )
+    if len(key_counts) < 2:
         return False  # need at least 2 common scalar keys
-    common = set(union)
-    for item in arr:
-        common &= set(k for k, v in flatten(item).items() if not isinstance(v, list))
-    return len(common) >= len(union) * 0.6
+    common = sum(1 for n in key_counts.values() if n == len(arr))
+    return common >= len(key_counts) * 0.6
 
 
 def is_kv_array(arr: list) -> bool:
@@ -216,9 +264,11 @@ def find_identity_column(cols: list[str], arr: list | None = None) -> str | None
             continue
         if len(matches) == 1 or arr is None:
             return matches[0]
-        # Pick the column with the most distinct non-empty values
+        # Pick the column with the most distinct non-empty values; flatten
+        # each row once rather than once per candidate column.
+        flat_rows = [flatten(item) for item in arr]
         def _cardinality(col: str) -> int:
-            vals = {fmt(flatten(item).get(col)) for item in arr}
+            vals = {fmt(row.get(col)) for row in flat_rows}
             vals.discard("")
             return len(vals)
         return max(matches, key=_cardinality)
@@ -648,7 +698,7 @@ def render_table(name: str, arr: list, heuristics: Heuristics | None = None) ->
     return blocks
 
 
-def render_scalars(name: str, flat: OrderedDict) -> str:
+def render_scalars(name: str, flat: dict) -> str:
     """Encode scalar key-value pairs with TOON."""
     header = f"--- {name} (scalars) ---"
     toon_text = toon_format.encode(dict(flat))
@@ -759,18 +809,19 @@ def toon_encode_json(data: Any) -> str:  # noqa: D103
 
 # ── truncation ────────────────────────────────────────────────────────────────
 
-def truncate_to_token_limit(text: str, max_tokens: int) -> str:
+def truncate_to_token_limit(text: str, max_tokens: int, token_count: int | None = None) -> str:
     """Truncate text to fit within a token limit.
 
     If the text is within the limit, returns it unchanged.
-    If over, binary-searches for the longest character prefix that fits
-    within max_tokens (minus overhead for the truncation notice), then
-    appends a truncation message.
+    If over, keeps the longest token prefix that fits within max_tokens
+    (minus overhead for the truncation notice), then appends a truncation
+    message.  Pass *token_count* when the token count of *text* is already
+    known to skip re-tokenizing it.
     """
     if max_tokens <= 0:
         return text
 
-    orig_tokens = count_tokens(text)
+    orig_tokens = token_count if token_count is not None else count_tokens(text)
     if orig_tokens <= max_tokens:
         return text
 
@@ -785,17 +836,9 @@ def truncate_to_token_limit(text: str, max_tokens: int) -> str:
     if target <= 0:
         target = 1
 
-    # Binary search for longest prefix that fits within target tokens
-    lo, hi = 0, len(text)
-    while lo < hi:
-        mid = (lo + hi + 1) // 2
-        if count_tokens(text[:mid]) <= target:
-            lo = mid
-        else:
-            hi = mid - 1
-
-    truncated = text[:lo]
-    final_tokens = count_tokens(truncated) + notice_overhead
+    # Slice the token ids once rather than re-tokenizing candidate prefixes
+    truncated, kept_tokens = _token_prefix(text, target)
+    final_tokens = kept_tokens + notice_overhead
     notice = (
         f"\n\n[truncated: output exceeded {max_tokens} token limit"
         f" — {orig_tokens} tokens reduced to ~{final_tokens}]"
@@ -805,15 +848,35 @@ def truncate_to_token_limit(text: str, max_tokens: int) -> str:
 
 # ── stats ────────────────────────────────────────────────────────────────────
 
-def stats(orig: str, cond: str, orig_tok: int | None = None) -> dict:
+class TokenStats(NamedTuple):
+    """Token counts for one original/condensed pair."""
+    orig_tok: int
+    cond_tok: int
+    tok_pct: float
+
+
+def token_stats(orig: str, cond: str, orig_tok: int | None = None, cond_tok: int | None = None) -> TokenStats:
+    """Token-only counterpart of stats() for hot paths: no char counts, no dict."""
+    if orig_tok is None and cond_tok is None:
+        # Neither side is known: tokenize both in one batch
+        orig_tok, cond_tok = count_tokens_batch([orig, cond])
+    else:
+        if orig_tok is None:
+            orig_tok = count_tokens(orig)
+        if cond_tok is None:
+            cond_tok = count_tokens(cond)
+    tok_pct = round((1 - cond_tok/orig_tok)*100, 1) if orig_tok else 0.0
+    return TokenStats(orig_tok, cond_tok, tok_pct)
+
+
+def stats(orig: str, cond: str, orig_tok: int | None = None, cond_tok: int | None = None) -> dict:
     oc, cc = len(orig), len(cond)
-    ot = orig_tok if orig_tok is not None else count_tokens(orig)
-    ct = count_tokens(cond)
+    ot, ct, tok_pct = token_stats(orig, cond, orig_tok, cond_tok)
     return {
         "orig_chars": oc, "cond_chars": cc,
         "orig_tok": ot, "cond_tok": ct,
         "char_pct": round((1 - cc/oc)*100, 1) if oc else 0,
-        "tok_pct": round((1 - ct/ot)*100, 1) if ot else 0,
+        "tok_pct": tok_pct,
         "method": TOKEN_METHOD,
     }
 
@@ -5,20 +5,75 @@ Supports two modes:
   2. Multi-upstream via CONDENSER_CONFIG JSON file
 """
 
+import functools
 import json
 import os
 import sys
 from dataclasses import dataclass, field
 
 
-@dataclass
+_FALSY = frozenset({"false", "0", "no"})
+
+
+def _is_truthy(raw: str | None, *, default: bool) -> bool:
+    """Interpret a boolean env value; unset or empty falls back to *default*."""
+    value = (raw or "").strip().lower()
+    if not value:
+        return default
+    return value not in _FALSY
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_str_list(raw: str) -> tuple[str, ...]:
+    """Split a comma-separated env value into stripped, non-empty items."""
+    return tuple(t.strip() for t in raw.split(",") if t.strip())
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_kv_list(raw: str) -> tuple[tuple[str, str], ...]:
+    """Split a comma-separated ``name:value`` env value into stripped pairs.
+
+    Entries without a ``:`` are ignored.  The last ``:`` separates name from
+    value, so names may themselves contain colons.
+    """
+    out: list[tuple[str, str]] = []
+    for pair in raw.split(","):
+        name, sep, val = pair.rpartition(":")
+        if sep:
+            out.append((name.strip(), val.strip()))
+    return tuple(out)
+
+
+def _lower_header_names(headers: dict[str, str], *, values: bool = False) -> dict[str, str]:
+    """Lowercase header names (and, for name→name maps, the values too)."""
+    if values:
+        return {k.lower(): v.lower() for k, v in headers.items()}
+    return {k.lower(): v for k, v in headers.items()}
+
+
+def _coerce_heuristic(val: str) -> bool | int | float | str:
+    """Coerce a heuristic env value to int, float, bool, or leave as str."""
+    try:
+        return int(val)
+    except ValueError:
+        pass
+    try:
+        return float(val)
+    except ValueError:
+        pass
+    if val.lower() in ("true", "false", "yes", "no"):
+        return val.lower() in ("true", "yes")
+    return val
+
+
+@dataclass(slots=True)
 class ServerConfig:
     """Per-upstream server configuration."""
 
     url: str
     tools: list[str] | None = None  # None means all ("*")
-    headers: dict[str, str] = field(default_factory=dict)
-    forward_headers: dict[str, str] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)  # names lowercased at load
+    forward_headers: dict[str, str] = field(default_factory=dict)  # both sides lowercased at load
     condense: bool = True
     toon_only_tools: list[str] = field(default_factory=list)
     toon_fallback: bool = True
@@ -33,7 +88,7 @@ class ServerConfig:
     tool_format_hints: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProxyConfig:
     """Full proxy configuration."""
 
@@ -44,6 +99,7 @@ class ProxyConfig:
     prefix_tools: bool = True
     metrics_enabled: bool = False
     metrics_port: int = 9090
+    result_cache_chars: int = 2_000_000  # 0 disables the result cache
 
     @classmethod
     def from_env(cls) -> "ProxyConfig":
@@ -57,72 +113,47 @@ class ProxyConfig:
         if condense_tools_env == "*":
             tools = None
         else:
-            tools = [t.strip() for t in condense_tools_env.split(",") if t.strip()]
+            tools = list(_parse_str_list(condense_tools_env))
 
-        toon_only_env = os.environ.get("TOON_ONLY_TOOLS", "").strip()
-        toon_only = [t.strip() for t in toon_only_env.split(",") if t.strip()] if toon_only_env else []
+        toon_only = list(_parse_str_list(os.environ.get("TOON_ONLY_TOOLS", "").strip()))
 
-        toon_fallback_env = os.environ.get("TOON_FALLBACK", "true").strip().lower()
-        toon_fallback = toon_fallback_env not in ("false", "0", "no")
+        toon_fallback = _is_truthy(os.environ.get("TOON_FALLBACK"), default=True)
 
         min_token_threshold = int(os.environ.get("MIN_TOKEN_THRESHOLD", "0"))
 
-        revert_if_larger_env = os.environ.get("REVERT_IF_LARGER", "false").strip().lower()
-        revert_if_larger = revert_if_larger_env not in ("false", "0", "no")
+        revert_if_larger = _is_truthy(os.environ.get("REVERT_IF_LARGER"), default=False)
 
         max_token_limit = int(os.environ.get("MAX_TOKEN_LIMIT", "0"))
 
-        tool_token_limits_env = os.environ.get("TOOL_TOKEN_LIMITS", "").strip()
-        tool_token_limits: dict[str, int] = {}
-        if tool_token_limits_env:
-            for pair in tool_token_limits_env.split(","):
-                pair = pair.strip()
-                if ":" in pair:
-                    name, limit = pair.rsplit(":", 1)
-                    tool_token_limits[name.strip()] = int(limit.strip())
+        tool_token_limits: dict[str, int] = {
+            name: int(limit)
+            for name, limit in _parse_kv_list(os.environ.get("TOOL_TOKEN_LIMITS", "").strip())
+        }
 
         profile = os.environ.get("CONDENSER_PROFILE", "balanced").strip()
 
-        heuristics_env = os.environ.get("CONDENSER_HEURISTICS", "").strip()
-        heuristics: dict[str, bool | int | float | str] = {}
-        if heuristics_env:
-            for pair in heuristics_env.split(","):
-                pair = pair.strip()
-                if ":" in pair:
-                    name, val = pair.rsplit(":", 1)
-                    val = val.strip()
-                    try:
-                        heuristics[name.strip()] = int(val)
-                    except ValueError:
-                        try:
-                            heuristics[name.strip()] = float(val)
-                        except ValueError:
-                            if val.lower() in ("true", "false", "yes", "no"):
-                                heuristics[name.strip()] = val.lower() in ("true", "yes")
-                            else:
-                                heuristics[name.strip()] = val
+        heuristics: dict[str, bool | int | float | str] = {
+            name: _coerce_heuristic(val)
+            for name, val in _parse_kv_list(os.environ.get("CONDENSER_HEURISTICS", "").strip())
+        }
 
         format_hint_env = os.environ.get("FORMAT_HINT", "").strip() or None
-        tool_format_hints_env = os.environ.get("TOOL_FORMAT_HINTS", "").strip()
-        tool_format_hints: dict[str, str] = {}
-        if tool_format_hints_env:
-            for pair in tool_format_hints_env.split(","):
-                pair = pair.strip()
-                if ":" in pair:
-                    name, fmt = pair.rsplit(":", 1)
-                    tool_format_hints[name.strip()] = fmt.strip()
+        tool_format_hints: dict[str, str] = dict(
+            _parse_kv_list(os.environ.get("TOOL_FORMAT_HINTS", "").strip())
+        )
 
         host = os.environ.get("PROXY_HOST", "0.0.0.0")
         port = int(os.environ.get("PROXY_PORT", "9000"))
 
-        metrics_enabled_env = os.environ.get("METRICS_ENABLED", "false").strip().lower()
-        metrics_enabled = metrics_enabled_env not in ("false", "0", "no", "")
+        metrics_enabled = _is_truthy(os.environ.get("METRICS_ENABLED"), default=False)
         metrics_port = int(os.environ.get("METRICS_PORT", "9090"))
 
+        result_cache_chars = int(os.environ.get("RESULT_CACHE_CHARS", "2000000"))
+
         headers_env = os.environ.get("UPSTREAM_MCP_HEADERS", "").strip()
         headers: dict[str, str] = {}
         if headers_env:
-            headers = json.loads(headers_env)
+            headers = _lower_header_names(json.loads(headers_env))
 
         server = ServerConfig(
             url=url,
@@ -147,21 +178,27 @@ class ProxyConfig:
             multi_upstream=False,
             metrics_enabled=metrics_enabled,
             metrics_port=metrics_port,
+            result_cache_chars=result_cache_chars,
         )
 
     @classmethod
     def from_file(cls, path: str) -> "ProxyConfig":
         """Load config from a JSON file (multi-upstream mode)."""
-        with open(path) as f:
-            raw = json.load(f)
+        # Read raw bytes and let the JSON decoder handle UTF-8 directly.
+        # Stdlib json keeps the result independent of optional packages.
+        with open(path, "rb") as f:
+            raw = json.loads(f.read())
 
         global_cfg = raw.get("global", {})
         host = global_cfg.get("host", "0.0.0.0")
         port = global_cfg.get("port", 9000)
         prefix_tools = global_cfg.get("prefix_tools", True)
-        metrics_enabled_default = os.environ.get("METRICS_ENABLED", "false").strip().lower() not in ("false", "0", "no", "")
+        metrics_enabled_default = _is_truthy(os.environ.get("METRICS_ENABLED"), default=False)
         metrics_enabled = global_cfg.get("metrics_enabled", metrics_enabled_default)
         metrics_port = global_cfg.get("metrics_port", int(os.environ.get("METRICS_PORT", "9090")))
+        result_cache_chars = global_cfg.get(
+            "result_cache_chars", int(os.environ.get("RESULT_CACHE_CHARS", "2000000"))
+        )
 
         servers: dict[str, ServerConfig] = {}
         for name, srv in raw.get("servers", {}).items():
@@ -182,8 +219,8 @@ class ProxyConfig:
             servers[name] = ServerConfig(
                 url=srv["url"],
                 tools=tools,
-                headers=srv.get("headers", {}),
-                forward_headers=srv.get("forward_headers", {}),
+                headers=_lower_header_names(srv.get("headers", {})),
+                forward_headers=_lower_header_names(srv.get("forward_headers", {}), values=True),
                 condense=srv.get("condense", True),
                 toon_only_tools=toon_only,
                 toon_fallback=srv.get("toon_fallback", True),
@@ -206,6 +243,7 @@ class ProxyConfig:
             prefix_tools=prefix_tools,
             metrics_enabled=metrics_enabled,
             metrics_port=metrics_port,
+            result_cache_chars=result_cache_chars,
         )
 
     @classmethod
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import time
 from contextlib import contextmanager
-from typing import Protocol
+from typing import Any, Protocol
 
 
 class MetricsRecorder(Protocol):
@@ -22,26 +22,45 @@ class MetricsRecorder(Protocol):
 
 
 class NoopRecorder:
-    """No-op implementation — all methods are pass-through."""
+    """No-op implementation — all methods are pass-through.
 
-    def record_request(self, tool: str, server: str, mode: str) -> None:
+    Methods are static so calls skip binding ``self``; the module-level
+    ``NOOP_RECORDER`` instance is shared by every disabled recorder.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def record_request(tool: str, server: str, mode: str) -> None:
         pass
 
-    def record_tokens(self, tool: str, server: str, input_tokens: int, output_tokens: int) -> None:
+    @staticmethod
+    def record_tokens(tool: str, server: str, input_tokens: int, output_tokens: int) -> None:
         pass
 
-    def record_compression_ratio(self, tool: str, server: str, ratio: float) -> None:
+    @staticmethod
+    def record_compression_ratio(tool: str, server: str, ratio: float) -> None:
         pass
 
-    def record_processing_seconds(self, tool: str, server: str, duration: float) -> None:
+    @staticmethod
+    def record_processing_seconds(tool: str, server: str, duration: float) -> None:
         pass
 
-    def record_truncation(self, tool: str, server: str) -> None:
+    @staticmethod
+    def record_truncation(tool: str, server: str) -> None:
         pass
 
 
+NOOP_RECORDER = NoopRecorder()
+
+
 class PrometheusRecorder:
-    """Records metrics using prometheus_client."""
+    """Records metrics using prometheus_client.
+
+    Labelled children are resolved once per metric and label tuple and then
+    cached, so recording skips prometheus_client's per-call label validation
+    and lock.  Children are still created lazily, on first record.
+    """
 
     def __init__(self, registry=None):
         from prometheus_client import CollectorRegistry, Counter, Histogram
@@ -95,24 +114,33 @@ class PrometheusRecorder:
             registry=registry,
         )
 
+        self._children: dict[tuple[Any, ...], Any] = {}
+
+    def _child(self, metric: Any, *labels: str) -> Any:
+        key = (metric, *labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = metric.labels(*labels)
+        return child
+
     def record_request(self, tool: str, server: str, mode: str) -> None:
-        self.requests_total.labels(tool=tool, server=server, mode=mode).inc()
+        self._child(self.requests_total, tool, server, mode).inc()
 
     def record_tokens(self, tool: str, server: str, input_tokens: int, output_tokens: int) -> None:
-        self.input_tokens_total.labels(tool=tool, server=server).inc(input_tokens)
-        self.output_tokens_total.labels(tool=tool, server=server).inc(output_tokens)
+        self._child(self.input_tokens_total, tool, server).inc(input_tokens)
+        self._child(self.output_tokens_total, tool, server).inc(output_tokens)
         saved = input_tokens - output_tokens
         if saved > 0:
-            self.saved_tokens_total.labels(tool=tool, server=server).inc(saved)
+            self._child(self.saved_tokens_total, tool, server).inc(saved)
 
     def record_compression_ratio(self, tool: str, server: str, ratio: float) -> None:
-        self.compression_ratio.labels(tool=tool, server=server).observe(ratio)
+        self._child(self.compression_ratio, tool, server).observe(ratio)
 
     def record_processing_seconds(self, tool: str, server: str, duration: float) -> None:
-        self.processing_seconds.labels(tool=tool, server=server).observe(duration)
+        self._child(self.processing_seconds, tool, server).observe(duration)
 
     def record_truncation(self, tool: str, server: str) -> None:
-        self.truncations_total.labels(tool=tool, server=server).inc()
+        self._child(self.truncations_total, tool, server).inc()
 
 
 @contextmanager
@@ -136,7 +164,7 @@ def timer():
 def create_recorder(enabled: bool = False, port: int = 9090) -> NoopRecorder | PrometheusRecorder:
     """Factory: start metrics HTTP server when enabled, return appropriate recorder."""
     if not enabled:
-        return NoopRecorder()
+        return NOOP_RECORDER
 
     from prometheus_client import start_http_server
 
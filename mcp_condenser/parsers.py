@@ -7,12 +7,30 @@ can be registered via ``register_parser()``.
 import csv
 import io
 import json
+import re
 import xml.etree.ElementTree as ET
-from collections import Counter
+from enum import StrEnum
 from typing import Any, Callable, NamedTuple
 
 import yaml
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class InputFormat(StrEnum):
+    """Names of the built-in parsers.
+
+    Members are plain strings, so they compare equal to the names used in
+    format hints and to custom parser names.
+    """
+    JSON = "json"
+    YAML = "yaml"
+    CSV = "csv"
+    XML = "xml"
+
 
 class Parser(NamedTuple):
     """A pluggable input parser.
@@ -30,9 +48,29 @@ class Parser(NamedTuple):
 
 # ── built-in parsers ─────────────────────────────────────────────────────
 
+if orjson is not None:
+    # orjson decodes integers outside [-2**63, 2**64) as lossy floats.  Any
+    # such integer has at least 19 digits (e.g. -9223372036854775809), so
+    # 19+ digit runs go straight to the stdlib decoder; a false positive
+    # only costs speed.
+    _LONG_DIGITS_RE = re.compile(r"\d{19}")
+
+    def _json_loads(text: str) -> Any:
+        if _LONG_DIGITS_RE.search(text) is None:
+            try:
+                return orjson.loads(text)
+            except orjson.JSONDecodeError:
+                # orjson also rejects NaN/Infinity; let the stdlib decoder
+                # have the final say.
+                pass
+        return json.loads(text)
+else:
+    _json_loads = json.loads
+
+
 def _try_json(text: str) -> tuple[Any, str] | None:
     try:
-        return json.loads(text), "json"
+        return _json_loads(text), InputFormat.JSON
     except (json.JSONDecodeError, TypeError):
         return None
 
@@ -43,7 +81,7 @@ def _try_yaml(text: str) -> tuple[Any, str] | None:
         # yaml.safe_load returns str for plain scalars and None for empty —
         # only accept dicts/lists as meaningful structured data
         if isinstance(data, (dict, list)):
-            return data, "yaml"
+            return data, InputFormat.YAML
     except yaml.YAMLError:
         pass
     return None
@@ -75,28 +113,26 @@ def _try_csv(text: str) -> tuple[Any, str] | None:
     if not rows:
         return None
 
-    return rows, "csv"
+    return rows, InputFormat.CSV
+
+
+def _infer_csv_value(v: str | None) -> Any:
+    """Infer the type of a single CSV cell: int, float, None for empty."""
+    if v is None or v == "":
+        return None
+    # Try int, then float, fall back to string
+    try:
+        return int(v)
+    except ValueError:
+        try:
+            return float(v)
+        except ValueError:
+            return v
 
 
 def _normalize_csv(data: list[dict[str, str]]) -> list[dict[str, Any]]:
     """Infer types for CSV string values: int, float, None for empty."""
-    out: list[dict[str, Any]] = []
-    for row in data:
-        new: dict[str, Any] = {}
-        for k, v in row.items():
-            if v is None or v == "":
-                new[k] = None
-            else:
-                # Try int, then float, fall back to string
-                try:
-                    new[k] = int(v)
-                except ValueError:
-                    try:
-                        new[k] = float(v)
-                    except ValueError:
-                        new[k] = v
-        out.append(new)
-    return out
+    return [{k: _infer_csv_value(v) for k, v in row.items()} for row in data]
 
 
 def _xml_elem_to_dict(elem: ET.Element) -> dict[str, Any]:
@@ -114,19 +150,18 @@ def _xml_elem_to_dict(elem: ET.Element) -> dict[str, Any]:
     for k, v in elem.attrib.items():
         d[f"@{k}"] = _coerce_xml_value(v)
 
-    # Group children by tag
-    child_counts: Counter[str] = Counter(c.tag for c in elem)
+    # Group children by tag in a single pass; the group size doubles as the
+    # repeat count, so no separate tag Counter is needed.
     child_groups: dict[str, list[Any]] = {}
     for child in elem:
-        tag = child.tag
-        converted = _xml_elem_to_dict(child)
-        child_groups.setdefault(tag, []).append(converted)
+        group = child_groups.get(child.tag)
+        if group is None:
+            child_groups[child.tag] = [_xml_elem_to_dict(child)]
+        else:
+            group.append(_xml_elem_to_dict(child))
 
     for tag, items in child_groups.items():
-        if child_counts[tag] == 1:
-            d[tag] = items[0]
-        else:
-            d[tag] = items
+        d[tag] = items[0] if len(items) == 1 else items
 
     # Text content
     text = (elem.text or "").strip()
@@ -167,16 +202,16 @@ def _try_xml(text: str) -> tuple[Any, str] | None:
         root = ET.fromstring(stripped)
     except ET.ParseError:
         return None
-    return _xml_elem_to_dict(root), "xml"
+    return _xml_elem_to_dict(root), InputFormat.XML
 
 
 # ── registry ─────────────────────────────────────────────────────────────
 
 PARSER_REGISTRY: list[Parser] = [
-    Parser(name="json", try_parse=_try_json),
-    Parser(name="yaml", try_parse=_try_yaml),
-    Parser(name="csv", try_parse=_try_csv, normalize=_normalize_csv),
-    Parser(name="xml", try_parse=_try_xml),
+    Parser(name=InputFormat.JSON, try_parse=_try_json),
+    Parser(name=InputFormat.YAML, try_parse=_try_yaml),
+    Parser(name=InputFormat.CSV, try_parse=_try_csv, normalize=_normalize_csv),
+    Parser(name=InputFormat.XML, try_parse=_try_xml),
 ]
 
 
@@ -194,6 +229,60 @@ def register_parser(parser: Parser, *, priority: int | None = None) -> None:
         PARSER_REGISTRY.insert(priority, parser)
 
 
+# ── format sniffing ──────────────────────────────────────────────────────
+
+# Single-pass classifier over the start of the input.  The CSV branch only
+# claims a first line with no ``:`` so YAML mappings are never routed past
+# the YAML parser.
+_FORMAT_GUESS_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<json>[\[{])"
+    r"|(?P<xml><[?!A-Za-z_])"
+    r"|(?P<yaml>---|%YAML|-[ \t]|[\w.-]+:[ \t\r\n])"
+    r"|(?P<csv>[^\s\-#%?!&*\[{<\"'][^\n:]*?[,\t|;][^\n:]*\n)"
+    r")"
+)
+_GUESS_PREFIX = 512
+
+
+def _guess_format(text: str) -> InputFormat | None:
+    """Guess the built-in format of *text* from its first few hundred chars.
+
+    Returns ``None`` when the prefix is not distinctive enough.
+    """
+    m = _FORMAT_GUESS_RE.match(text, 0, _GUESS_PREFIX)
+    if m is None:
+        return None
+    return InputFormat(m.lastgroup)
+
+
+# Every YAML collection, CSV table and XML document contains at least one of
+# these characters; text without any of them can only be a JSON scalar.
+_STRUCTURAL_RE = re.compile(r"[:\-,\t|;<\[{?]")
+
+
+def _builtin_only() -> bool:
+    return all(isinstance(p.name, InputFormat) for p in PARSER_REGISTRY)
+
+
+# First characters of every value the JSON parser accepts (including the
+# NaN/Infinity extensions), after leading whitespace.
+_JSON_VALUE_START = frozenset('{["-0123456789tfnNI')
+
+
+def is_plain_text(text: str) -> bool:
+    """Return True when *text* cannot parse as any registered format.
+
+    A cheap pre-check for callers that would otherwise call
+    ``parse_input()`` just to catch its ``ValueError``.  Always False while
+    custom parsers are registered, since their formats are unknown.
+    """
+    if _STRUCTURAL_RE.search(text) is not None or not _builtin_only():
+        return False
+    head = text.lstrip()
+    return not head or head[0] not in _JSON_VALUE_START
+
+
 # ── public entry point ───────────────────────────────────────────────────
 
 def parse_input(text: str, *, format_hint: str | None = None) -> tuple[Any, str]:
@@ -210,21 +299,42 @@ def parse_input(text: str, *, format_hint: str | None = None) -> tuple[Any, str]
     Raises:
         ValueError: No registered parser could parse the input.
     """
+    if format_hint is None and _STRUCTURAL_RE.search(text) is None and _builtin_only():
+        # Plain text: skip the YAML/CSV/XML passes, which cannot succeed
+        result = _try_json(text)
+        if result is not None:
+            return result
+        names = ", ".join(p.name for p in PARSER_REGISTRY)
+        raise ValueError(f"Input is not valid {names}")
+
+    if format_hint is None:
+        # Promote a guessed built-in parser, but only past other built-ins
+        # so custom parsers registered ahead of it keep their priority.
+        guess = _guess_format(text)
+        if guess is not None:
+            for p in PARSER_REGISTRY:
+                if p.name == guess:
+                    format_hint = guess
+                    break
+                if not isinstance(p.name, InputFormat):
+                    break
+
+    hinted: Parser | None = None
     if format_hint is not None:
-        # Try the hinted parser first
-        for p in PARSER_REGISTRY:
-            if p.name == format_hint:
-                result = p.try_parse(text)
-                if result is not None:
-                    data, name = result
-                    if p.normalize is not None:
-                        data = p.normalize(data)
-                    return data, name
-                break  # hint didn't match — fall through to full scan
+        # Try the first parser registered under the hinted name
+        hinted = next((p for p in PARSER_REGISTRY if p.name == format_hint), None)
+        if hinted is not None:
+            result = hinted.try_parse(text)
+            if result is not None:
+                data, name = result
+                if hinted.normalize is not None:
+                    data = hinted.normalize(data)
+                return data, name
+            # hint didn't match — fall through to full scan
 
     # Full registry scan (skip the hinted parser if it already failed)
     for p in PARSER_REGISTRY:
-        if format_hint is not None and p.name == format_hint:
+        if p is hinted:
             continue
         result = p.try_parse(text)
         if result is not None:
@@ -23,6 +23,8 @@ Configuration (environment variables — single-upstream mode):
                            (default: 0 = off / no limit)
     TOOL_TOKEN_LIMITS   — comma-separated tool_name:limit pairs for per-tool
                            token limit overrides (default: empty)
+    RESULT_CACHE_CHARS  — character budget for memoized condensed results
+                           (default: 2000000; 0 = off)
     PROXY_HOST          — bind host (default: 0.0.0.0)
     PROXY_PORT          — bind port (default: 9000)
 
@@ -40,19 +42,29 @@ Usage:
     CONDENSER_CONFIG=config.json python mcp_proxy.py
 """
 
+import asyncio
+import atexit
 import contextlib
 import datetime
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
+from collections import ChainMap, OrderedDict
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
-from typing import cast
+from typing import Any, NamedTuple, cast
 
 import httpx
 from fastmcp import FastMCP
+from fastmcp.client.client import Client
 from fastmcp.client.transports import StreamableHttpTransport
 from fastmcp.server.dependencies import get_http_headers
 from fastmcp.server.middleware import Middleware
+from fastmcp.server.proxy import ProxyTool
 from fastmcp.tools.tool import ToolResult
 from mcp import ClientSession
 from mcp.client.streamable_http import streamable_http_client
@@ -60,14 +72,20 @@ from mcp.shared._httpx_utils import create_mcp_http_client
 from mcp.types import TextContent
 from typing_extensions import Unpack
 
-from mcp_condenser.condenser import PROFILES, Heuristics, condense_text, toon_encode, stats, count_tokens, truncate_to_token_limit
-from mcp_condenser.parsers import parse_input
+from mcp_condenser.condenser import PROFILES, Heuristics, condense_text, toon_encode, token_stats, count_tokens, count_tokens_batch, truncate_to_token_limit
+from mcp_condenser.parsers import is_plain_text, parse_input
 from mcp_condenser.config import ProxyConfig, ServerConfig
-from mcp_condenser.metrics import MetricsRecorder, NoopRecorder, create_recorder, timer
+from mcp_condenser.metrics import NOOP_RECORDER, MetricsRecorder, create_recorder, timer
 
 logger = logging.getLogger("mcp_condenser")
 
 
+@functools.lru_cache(maxsize=16)
+def _read_timeout(seconds: float) -> httpx.Timeout:
+    """Shared Timeout per read timeout; httpx never mutates them."""
+    return httpx.Timeout(30.0, read=seconds)
+
+
 class _ForwardingTransport(StreamableHttpTransport):
     """Transport that selectively forwards and renames incoming request headers.
 
@@ -83,28 +101,38 @@ class _ForwardingTransport(StreamableHttpTransport):
         forward_headers: dict[str, str] | None = None,
     ):
         super().__init__(url, headers=headers)
-        self._forward_map = forward_headers or {}
+        # Lowercased once here; incoming header names are already lowercase.
+        self._forward_map: tuple[tuple[str, str], ...] = tuple(
+            (src.lower(), dst.lower()) for src, dst in (forward_headers or {}).items()
+        )
+        # Lowercase static names too, so they replace (not duplicate) a
+        # translated header that differs only in case.
+        self._static_headers = {k.lower(): v for k, v in self.headers.items()}
+
+    def _outgoing_headers(self) -> dict[str, str]:
+        """Build upstream headers from the incoming request and static config."""
+        # Translate incoming headers per the mapping instead of forwarding all
+        incoming = get_http_headers()
+        headers = {
+            dst: val for src, dst in self._forward_map
+            if (val := incoming.get(src)) is not None
+        }
+        # Static headers override translated headers (merged in place)
+        headers.update(self._static_headers)
+        return headers
 
     @contextlib.asynccontextmanager
     async def connect_session(
         self, **session_kwargs: Unpack["StreamableHttpTransport.SessionKwargs"],  # type: ignore[override]
     ) -> AsyncIterator[ClientSession]:
-        # Translate incoming headers per the mapping instead of forwarding all
-        incoming = get_http_headers()
-        translated = {}
-        for src, dst in self._forward_map.items():
-            val = incoming.get(src.lower())
-            if val is not None:
-                translated[dst.lower()] = val
-        # Static headers override translated headers
-        headers = translated | self.headers
+        headers = self._outgoing_headers()
 
         timeout: httpx.Timeout | None = None
         if session_kwargs.get("read_timeout_seconds") is not None:
             read_timeout_seconds = cast(
                 datetime.timedelta, session_kwargs.get("read_timeout_seconds")
             )
-            timeout = httpx.Timeout(30.0, read=read_timeout_seconds.total_seconds())
+            timeout = _read_timeout(read_timeout_seconds.total_seconds())
 
         if self.httpx_client_factory is not None:
             http_client = self.httpx_client_factory(
@@ -132,23 +160,102 @@ class _ForwardingTransport(StreamableHttpTransport):
                 yield session
 
 
-def _make_client(srv_cfg: ServerConfig):
-    """Create a FastMCP Client with per-upstream headers when configured."""
-    from fastmcp.client.client import Client
+def _build_heuristics(cfg: ServerConfig, base_name: str | None) -> Heuristics | None:
+    """Merge profile defaults → server overrides → tool overrides.
+
+    Returns None when nothing is configured, so condense_text falls back to
+    its own defaults.
+    """
+    # Lookup view, first map wins; no intermediate dict is built
+    merged = ChainMap(
+        cfg.tool_heuristics.get(base_name, {}),
+        cfg.heuristics,
+        PROFILES.get(cfg.profile, {}),
+    )
+    if not any(merged.maps):
+        return None
+    try:
+        return Heuristics(**merged)
+    except TypeError as exc:
+        valid_keys = ", ".join(f.name for f in Heuristics.__dataclass_fields__.values())
+        raise TypeError(
+            f"Invalid heuristics configuration {dict(merged)!r}: {exc}. "
+            f"Valid heuristic names are: {valid_keys}"
+        ) from exc
+
+
+class _ResolvedTool(NamedTuple):
+    """Per-tool settings derived from a ServerConfig, cached by tool name."""
+    cfg: ServerConfig
+    server_name: str
+    base_name: str
+    format_hint: str | None
+    heuristics: Heuristics | None
+    mode: str | None  # "toon_only", "condense", "toon_fallback", or None
+    token_limit: int  # 0 = no truncation
+
+
+class _ResultCache:
+    """LRU of condensed results, bounded by total characters held.
+
+    Keys are ``(tool name, original text)``; each entry is charged the
+    length of both the original and the condensed text.  Shared by the
+    worker threads that run ``_process_text_items``, hence the lock.
+    """
 
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: tuple[str, str], value: Any, size: int) -> None:
+        if size > self.max_chars:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (value, size)
+            self._chars += size
+            while self._chars > self.max_chars:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._chars -= evicted
+
+
+def _needs_token_count(text: str, threshold: int) -> bool:
+    """True when the min_token_threshold check on *text* runs the tokenizer.
+
+    Mirrors the checks in ``CondenserMiddleware._condense_item``: plain text
+    passes through and short ASCII text is skipped without a count.
+    """
+    if text.isascii() and len(text) < threshold:
+        return False
+    return not is_plain_text(text)
+
+
+def _make_client(srv_cfg: ServerConfig) -> Client:
+    """Create a FastMCP Client with per-upstream headers when configured."""
+    transport: StreamableHttpTransport | str
     if srv_cfg.forward_headers:
         transport = _ForwardingTransport(
             url=srv_cfg.url,
             headers=srv_cfg.headers or None,
             forward_headers=srv_cfg.forward_headers,
         )
-        return Client(transport)
-    if srv_cfg.headers:
-        from fastmcp.client.transports import StreamableHttpTransport
-
+    elif srv_cfg.headers:
         transport = StreamableHttpTransport(url=srv_cfg.url, headers=srv_cfg.headers)
-        return Client(transport)
-    return Client(srv_cfg.url)
+    else:
+        # Bare URL: let fastmcp infer the transport (SSE for /sse endpoints)
+        transport = srv_cfg.url
+    return Client(transport)
 
 
 class CondenserMiddleware(Middleware):
@@ -159,6 +266,8 @@ class CondenserMiddleware(Middleware):
         server_configs: dict[str, ServerConfig],
         tool_server_map: dict[str, str] | None = None,
         metrics: MetricsRecorder | None = None,
+        base_name_map: dict[str, str] | None = None,
+        result_cache_chars: int = 2_000_000,
     ):
         """
         Args:
@@ -166,142 +275,301 @@ class CondenserMiddleware(Middleware):
             tool_server_map: Map of tool name → server name. When None,
                 uses the first (only) server config for all tools.
             metrics: Metrics recorder (NoopRecorder when None).
+            base_name_map: Map of registered tool name → upstream tool name,
+                filled alongside tool_server_map.  Tools missing from it
+                have their server prefix stripped on first use.
+            result_cache_chars: Character budget for memoized condensed
+                results, so repeated upstream responses skip the parse and
+                encode.  Entries hold the raw upstream text, so keep this
+                small.  0 disables the cache.
         """
         super().__init__()
         self.server_configs = server_configs
         self.tool_server_map = tool_server_map
-        self.metrics: MetricsRecorder = metrics or NoopRecorder()
+        self.metrics: MetricsRecorder = metrics or NOOP_RECORDER
+        self._tool_cache: dict[str, _ResolvedTool] = {}
+        self._base_names: dict[str, str] = base_name_map if base_name_map is not None else {}
+        # tool name → (server name, config); only mapped tools are memoized
+        self._tool_servers: dict[str, tuple[str, ServerConfig | None]] = {}
+        self._any_condense = any(cfg.condense for cfg in server_configs.values())
+        self._result_cache = _ResultCache(result_cache_chars) if result_cache_chars > 0 else None
+        # Single-upstream answer for every tool
+        self._sole_server: tuple[str, ServerConfig | None] = (
+            next(iter(server_configs), "default"),
+            next(iter(server_configs.values())) if len(server_configs) == 1 else None,
+        )
+
+        # Build every configured heuristics combination up front so invalid
+        # names fail at startup; key (server, None) is the server default.
+        self._heuristics: dict[tuple[str, str | None], Heuristics | None] = {}
+        for server_name, cfg in server_configs.items():
+            self._heuristics[(server_name, None)] = _build_heuristics(cfg, None)
+            for base_name in cfg.tool_heuristics:
+                self._heuristics[(server_name, base_name)] = _build_heuristics(cfg, base_name)
+
+    def _resolve_server(self, tool_name: str) -> tuple[str, ServerConfig | None]:
+        """Map a tool name to its server name and ServerConfig.
+
+        Unmapped tools resolve to ``("unknown", None)``.
+        """
+        if self.tool_server_map is None:
+            return self._sole_server
+        entry = self._tool_servers.get(tool_name)
+        if entry is not None:
+            return entry
+        server_name = self.tool_server_map.get(tool_name)
+        if not server_name:
+            return "unknown", None
+        entry = (server_name, self.server_configs.get(server_name))
+        self._tool_servers[tool_name] = entry
+        return entry
 
     def _resolve_server_name(self, tool_name: str) -> str:
         """Map a tool name to its server name for metric labels."""
-        if self.tool_server_map is not None:
-            return self.tool_server_map.get(tool_name, "unknown")
-        return next(iter(self.server_configs), "default")
+        return self._resolve_server(tool_name)[0]
 
     def _resolve_server_config(self, tool_name: str) -> ServerConfig | None:
         """Map a tool name back to its ServerConfig."""
-        if self.tool_server_map is not None:
-            server_name = self.tool_server_map.get(tool_name)
-            if server_name:
-                return self.server_configs.get(server_name)
-            return None
-        # Single-upstream: return the one config
-        if len(self.server_configs) == 1:
-            return next(iter(self.server_configs.values()))
-        return None
+        return self._resolve_server(tool_name)[1]
 
     def _should_process(self, tool_name: str, cfg: ServerConfig) -> bool:
         """Check if a tool should be processed by any condensing path."""
         if not cfg.condense:
             return False
-        # Check toon_only list (unprefixed tool name)
-        base_name = self._base_tool_name(tool_name)
-        if base_name in cfg.toon_only_tools:
-            return True
-        # Check condense tools allowlist
-        if cfg.tools is None or base_name in cfg.tools:
-            return True
-        if cfg.toon_fallback:
-            return True
-        return False
+        return self._resolve_tool(tool_name, cfg).mode is not None
 
     def _base_tool_name(self, tool_name: str) -> str:
-        """Strip server prefix from tool name if present."""
-        if self.tool_server_map and tool_name in self.tool_server_map:
-            server_name = self.tool_server_map[tool_name]
-            prefix = f"{server_name}_"
-            if tool_name.startswith(prefix):
-                return tool_name[len(prefix):]
-        return tool_name
-
-    def _condense_item(self, text: str, tool_name: str, cfg: ServerConfig) -> tuple[str, str] | None:
-        """Apply condensing to a single text item.
+        """Strip server prefix from tool name if present.
 
-        Returns (condensed_text, mode) or None if no condensing was applied.
+        Names come from base_name_map when it was supplied; otherwise they
+        are stripped and memoized for tools in tool_server_map, which only
+        grows after construction.
         """
-        server_name = self._resolve_server_name(tool_name)
-        base_name = self._base_tool_name(tool_name)
-
-        # Resolve format hint: per-tool override takes precedence
-        hint = cfg.tool_format_hints.get(base_name, cfg.format_hint)
-
-        try:
-            data, input_fmt = parse_input(text, format_hint=hint)
-        except ValueError:
-            self.metrics.record_request(tool_name, server_name, "passthrough")
-            return None
+        base_name = self._base_names.get(tool_name)
+        if base_name is not None:
+            return base_name
+        if self.tool_server_map and tool_name in self.tool_server_map:
+            base_name = tool_name.removeprefix(f"{self.tool_server_map[tool_name]}_")
+            self._base_names[tool_name] = base_name
+            return base_name
+        return tool_name
 
-        orig_tokens = count_tokens(text)
+    def _heuristics_for(self, server_name: str, base_name: str, cfg: ServerConfig) -> Heuristics | None:
+        """Look up prebuilt heuristics, building them only for unknown configs."""
+        if self.server_configs.get(server_name) is not cfg:
+            return _build_heuristics(cfg, base_name)
+        if base_name in cfg.tool_heuristics:
+            return self._heuristics[(server_name, base_name)]
+        return self._heuristics[(server_name, None)]
 
-        # Check minimum token threshold
-        if cfg.min_token_threshold > 0 and orig_tokens < cfg.min_token_threshold:
-            logger.info(
-                "tool=%s action=skipped tokens=%d threshold=%d",
-                tool_name, orig_tokens, cfg.min_token_threshold,
-            )
-            self.metrics.record_request(tool_name, server_name, "skipped")
-            return None
+    def _resolve_tool(self, tool_name: str, cfg: ServerConfig) -> _ResolvedTool:
+        """Resolve the names, format hint, heuristics and mode for a tool.
 
-        # Build heuristics: profile defaults → server overrides → tool overrides
-        merged = dict(PROFILES.get(cfg.profile, {}))
-        merged.update(cfg.heuristics)
-        merged.update(cfg.tool_heuristics.get(base_name, {}))
-        if merged:
-            try:
-                h = Heuristics(**merged)
-            except TypeError as exc:
-                valid_keys = ", ".join(f.name for f in Heuristics.__dataclass_fields__.values())
-                raise TypeError(
-                    f"Invalid heuristics configuration {merged!r}: {exc}. "
-                    f"Valid heuristic names are: {valid_keys}"
-                ) from exc
-        else:
-            h = None
+        Results are cached per tool name; configs are not mutated at runtime.
+        Tools missing from a tool_server_map are not cached, since the map is
+        filled in after the middleware is constructed.
+        """
+        resolved = self._tool_cache.get(tool_name)
+        if resolved is not None and resolved.cfg is cfg:
+            return resolved
 
+        base_name = self._base_tool_name(tool_name)
         # 1. TOON_ONLY → direct TOON encoding
         if base_name in cfg.toon_only_tools:
-            condensed = toon_encode(data)
             mode = "toon_only"
         # 2. CONDENSE (or *) → full pipeline
         elif cfg.tools is None or base_name in cfg.tools:
-            condensed = condense_text(data, heuristics=h)
             mode = "condense"
         # 3. TOON_FALLBACK → direct TOON encoding
         elif cfg.toon_fallback:
-            condensed = toon_encode(data)
             mode = "toon_fallback"
         # 4. No match
         else:
+            mode = None
+
+        server_name = self._resolve_server_name(tool_name)
+        resolved = _ResolvedTool(
+            cfg=cfg,
+            server_name=server_name,
+            base_name=base_name,
+            # Per-tool format hint takes precedence
+            format_hint=cfg.tool_format_hints.get(base_name, cfg.format_hint),
+            heuristics=self._heuristics_for(server_name, base_name, cfg),
+            mode=mode,
+            # Per-tool token limit takes precedence
+            token_limit=cfg.tool_token_limits.get(base_name, cfg.max_token_limit),
+        )
+        if self.tool_server_map is None or tool_name in self.tool_server_map:
+            self._tool_cache[tool_name] = resolved
+        return resolved
+
+    def _condense_item(
+        self, text: str, tool_name: str, cfg: ServerConfig, orig_tokens: int | None = None,
+        tool: _ResolvedTool | None = None,
+    ) -> tuple[str, str, int] | None:
+        """Apply condensing to a single text item.
+
+        *orig_tokens* may carry a precomputed token count for *text*, and
+        *tool* the already resolved settings for *tool_name*.
+        Returns (condensed_text, mode, condensed_tokens) or None if no
+        condensing was applied.
+        """
+        if tool is None:
+            tool = self._resolve_tool(tool_name, cfg)
+        server_name = tool.server_name
+        mode = tool.mode
+
+        # No condensing path applies — skip parsing entirely
+        if mode is None:
             self.metrics.record_request(tool_name, server_name, "passthrough")
             return None
 
-        s = stats(text, condensed, orig_tok=orig_tokens)
+        # Plain text (errors, log lines) can't parse; skip the exception path.
+        # Checked before the threshold so such items stay 'passthrough'.
+        if is_plain_text(text):
+            self.metrics.record_request(tool_name, server_name, "passthrough")
+            return None
+
+        # Check minimum token threshold before paying for a parse.  Other
+        # unparsable text below the threshold is recorded as 'skipped'.
+        threshold = cfg.min_token_threshold
+        if threshold > 0:
+            # A token is at least one UTF-8 byte, so short ASCII text is
+            # below the threshold without running the tokenizer.
+            if text.isascii() and len(text) < threshold:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "tool=%s action=skipped chars=%d threshold=%d",
+                        tool_name, len(text), threshold,
+                    )
+                self.metrics.record_request(tool_name, server_name, "skipped")
+                return None
+            if orig_tokens is None:
+                orig_tokens = count_tokens(text)
+            if orig_tokens < threshold:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "tool=%s action=skipped tokens=%d threshold=%d",
+                        tool_name, orig_tokens, threshold,
+                    )
+                self.metrics.record_request(tool_name, server_name, "skipped")
+                return None
+
+        # Output depends only on the text and the tool's (static) settings,
+        # so a repeated response reuses the earlier result.
+        cache = self._result_cache
+        cached = cache.get((tool_name, text)) if cache is not None else None
+        if cached is not None and cached[0] is tool.cfg:
+            _, condensed, input_fmt, s = cached
+        else:
+            try:
+                data, input_fmt = parse_input(text, format_hint=tool.format_hint)
+            except ValueError:
+                self.metrics.record_request(tool_name, server_name, "passthrough")
+                return None
+
+            if mode == "condense":
+                condensed = condense_text(data, heuristics=tool.heuristics)
+            else:
+                condensed = toon_encode(data)
+
+            # The parsed data is used once and the original is tokenized at
+            # most once; when its count isn't known, token_stats() batches both.
+            s = token_stats(text, condensed, orig_tok=orig_tokens)
+            if cache is not None:
+                cache.put(
+                    (tool_name, text), (tool.cfg, condensed, input_fmt, s),
+                    len(text) + len(condensed),
+                )
 
         # Revert if condensed is larger
-        if cfg.revert_if_larger and s["cond_tok"] >= s["orig_tok"]:
-            logger.info(
-                "tool=%s mode=%s action=reverted condensed_tokens=%d original_tokens=%d",
-                tool_name, mode, s["cond_tok"], s["orig_tok"],
-            )
+        if cfg.revert_if_larger and s.cond_tok >= s.orig_tok:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "tool=%s mode=%s action=reverted condensed_tokens=%d original_tokens=%d",
+                    tool_name, mode, s.cond_tok, s.orig_tok,
+                )
             self.metrics.record_request(tool_name, server_name, "reverted")
             return None
 
-        logger.info(
-            "tool=%s mode=%s format=%s input_tokens=%d output_tokens=%d reduction_pct=%.1f",
-            tool_name, mode, input_fmt, s["orig_tok"], s["cond_tok"], s["tok_pct"],
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "tool=%s mode=%s format=%s input_tokens=%d output_tokens=%d reduction_pct=%.1f",
+                tool_name, mode, input_fmt, s.orig_tok, s.cond_tok, s.tok_pct,
+            )
 
         self.metrics.record_request(tool_name, server_name, mode)
-        self.metrics.record_tokens(tool_name, server_name, s["orig_tok"], s["cond_tok"])
-        if s["orig_tok"] > 0:
+        self.metrics.record_tokens(tool_name, server_name, s.orig_tok, s.cond_tok)
+        if s.orig_tok > 0:
             self.metrics.record_compression_ratio(
-                tool_name, server_name, s["cond_tok"] / s["orig_tok"]
+                tool_name, server_name, s.cond_tok / s.orig_tok
             )
 
-        return condensed, mode
+        return condensed, mode, s.cond_tok
+
+    def _process_text_items(
+        self, text_items: list[TextContent], tool_name: str, cfg: ServerConfig,
+        tool: _ResolvedTool,
+    ) -> bool:
+        """Condense and truncate *text_items* in place.
+
+        Returns True if any item was condensed.
+        """
+        server_name = tool.server_name
+        effective_limit = tool.token_limit
+
+        # Tokenize the items that reach the threshold comparison in one
+        # batched call; the rest are decided without a token count.
+        orig_counts: list[int | None] = [None] * len(text_items)
+        threshold = cfg.min_token_threshold
+        if tool.mode is not None and threshold > 0:
+            pending = [
+                i for i, it in enumerate(text_items)
+                if _needs_token_count(it.text, threshold)
+            ]
+            if len(pending) > 1:
+                counts = count_tokens_batch([text_items[i].text for i in pending])
+                for i, n in zip(pending, counts):
+                    orig_counts[i] = n
+        # Single pass over the text items: condense, then truncate each one
+        condensed_any = False
+        for item, orig_tokens in zip(text_items, orig_counts):
+            with timer() as elapsed:
+                condensed_result = self._condense_item(item.text, tool_name, cfg, orig_tokens, tool)
+            self.metrics.record_processing_seconds(tool_name, server_name, elapsed())
+
+            # Token count of item.text, when one is already known
+            known_tokens = orig_tokens
+            if condensed_result is not None:
+                item.text, _, known_tokens = condensed_result
+                condensed_any = True
+
+            if effective_limit <= 0:
+                continue
+
+            # Apply token limit truncation as final step.  A token covers at
+            # least one UTF-8 byte, so ASCII text no longer than the limit
+            # cannot exceed it and needs no tokenizer pass.
+            if not (
+                (known_tokens is not None and known_tokens <= effective_limit)
+                or (len(item.text) <= effective_limit and item.text.isascii())
+            ):
+                truncated = truncate_to_token_limit(item.text, effective_limit, known_tokens)
+                if truncated is not item.text:
+                    item.text = truncated
+                    self.metrics.record_truncation(tool_name, server_name)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "tool=%s action=truncated token_limit=%d",
+                            tool_name, effective_limit,
+                        )
+
+        return condensed_any
 
     async def on_list_tools(self, context, call_next):
         tools = await call_next(context)
+        if not self._any_condense:
+            return tools
         for tool in tools:
             cfg = self._resolve_server_config(tool.name)
             if cfg and self._should_process(tool.name, cfg):
@@ -312,58 +580,79 @@ class CondenserMiddleware(Middleware):
         tool_name = context.message.name
         result = await call_next(context)
 
-        cfg = self._resolve_server_config(tool_name)
+        server_name, cfg = self._resolve_server(tool_name)
         if not cfg or not cfg.condense:
-            server_name = self._resolve_server_name(tool_name)
             self.metrics.record_request(tool_name, server_name, "passthrough")
             return result
 
-        server_name = self._resolve_server_name(tool_name)
-
+        # Text items are edited in place; condensing is CPU-bound, so run the
+        # whole batch in a worker thread to keep the event loop free for
+        # other in-flight upstream calls.  Content items are exact mcp.types
+        # models, so an identity check on the type replaces isinstance().
+        text_items = [it for it in result.content if type(it) is TextContent]
         condensed_any = False
-        for item in result.content:
-            if not isinstance(item, TextContent):
-                continue
-
-            with timer() as elapsed:
-                condensed_result = self._condense_item(item.text, tool_name, cfg)
-            self.metrics.record_processing_seconds(tool_name, server_name, elapsed())
-
-            if condensed_result is not None:
-                item.text = condensed_result[0]
-                condensed_any = True
+        if text_items:
+            tool = self._resolve_tool(tool_name, cfg)
+            if tool.mode is None and tool.token_limit <= 0:
+                # Only metrics to record; not worth a thread hand-off
+                self._process_text_items(text_items, tool_name, cfg, tool)
+            else:
+                condensed_any = await asyncio.to_thread(
+                    self._process_text_items, text_items, tool_name, cfg, tool,
+                )
 
         # Clear structuredContent so the client uses our condensed text
         if condensed_any:
             result.structured_content = None
 
-        # Apply token limit truncation as final step
-        base_name = self._base_tool_name(tool_name)
-        effective_limit = cfg.tool_token_limits.get(base_name, cfg.max_token_limit)
-        if effective_limit > 0:
-            for item in result.content:
-                if not isinstance(item, TextContent):
-                    continue
-                truncated = truncate_to_token_limit(item.text, effective_limit)
-                if truncated is not item.text:
-                    item.text = truncated
-                    self.metrics.record_truncation(tool_name, server_name)
-                    logger.info(
-                        "tool=%s action=truncated token_limit=%d",
-                        tool_name, effective_limit,
-                    )
-
         return result
 
 
-def main():
-    logging.basicConfig(
-        format="%(asctime)s %(levelname)s %(name)s %(message)s",
-        level=logging.INFO,
-        stream=sys.stderr,
+def _warm_up() -> None:
+    """Exercise each pipeline stage once before serving.
+
+    Keeps tokenizer and encoder initialization off the first tool call.
+    """
+    start = time.perf_counter()
+    count_tokens("warm up")
+    parse_input('{"warm": [{"up": 1}]}')
+    condense_text([{"warm": 1, "up": "a"}, {"warm": 2, "up": "b"}])
+    toon_encode({"warm": "up"})
+    logger.info("initialized pipeline in %.2fms", (time.perf_counter() - start) * 1000)
+
+
+def _configure_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue to a background stderr writer.
+
+    Request handlers still merge the message arguments (QueueHandler.prepare
+    formats each record before enqueueing it); the final Formatter pass and
+    the blocking stderr write happen on the listener's thread.  Repeated
+    calls reuse the installed handler, like logging.basicConfig.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.listener is not None:
+            return handler.listener
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
     )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.listener = listener
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def main():
+    _configure_logging()
     config = ProxyConfig.load()
     metrics = create_recorder(enabled=config.metrics_enabled, port=config.metrics_port)
+    _warm_up()
 
     if config.multi_upstream:
         _run_multi_upstream(config, metrics)
@@ -379,6 +668,7 @@ def _run_single_upstream(config: ProxyConfig, metrics: MetricsRecorder):
     proxy.add_middleware(CondenserMiddleware(
         server_configs=config.servers,
         metrics=metrics,
+        result_cache_chars=config.result_cache_chars,
     ))
 
     condense_tools_desc = "*" if srv_cfg.tools is None else ",".join(srv_cfg.tools)
@@ -388,11 +678,12 @@ def _run_single_upstream(config: ProxyConfig, metrics: MetricsRecorder):
     logger.info(
         "starting host=%s port=%d upstream=%s condensing=%s toon_only=%s "
         "toon_fallback=%s min_token_threshold=%s revert_if_larger=%s "
-        "max_token_limit=%s tool_token_limits=%s metrics=%s",
+        "max_token_limit=%s tool_token_limits=%s result_cache_chars=%s metrics=%s",
         config.host, config.port, srv_cfg.url, condense_tools_desc,
         toon_only_desc, srv_cfg.toon_fallback,
         srv_cfg.min_token_threshold or "off", srv_cfg.revert_if_larger,
         srv_cfg.max_token_limit or "off", ttl_desc,
+        config.result_cache_chars or "off",
         f"http://0.0.0.0:{config.metrics_port}/metrics" if config.metrics_enabled else "off",
     )
 
@@ -401,18 +692,23 @@ def _run_single_upstream(config: ProxyConfig, metrics: MetricsRecorder):
 
 def _run_multi_upstream(config: ProxyConfig, metrics: MetricsRecorder):
     """Multi-upstream mode: aggregate tools from multiple upstreams."""
-    from fastmcp.server.proxy import ProxyTool
-
     tool_server_map: dict[str, str] = {}
+    base_name_map: dict[str, str] = {}
     prefix_tools = config.prefix_tools
 
+    async def _list_tools_for(srv_cfg: ServerConfig):
+        client = _make_client(srv_cfg)
+        async with client:
+            return client, await client.list_tools()
+
     @asynccontextmanager
     async def lifespan(server: FastMCP) -> AsyncIterator[None]:
-        for server_name, srv_cfg in config.servers.items():
-            client = _make_client(srv_cfg)
-            async with client:
-                mcp_tools = await client.list_tools()
-
+        # Probe all upstreams concurrently, then register in config order so
+        # collision detection stays deterministic.
+        listings = await asyncio.gather(
+            *(_list_tools_for(srv_cfg) for srv_cfg in config.servers.values())
+        )
+        for (server_name, srv_cfg), (client, mcp_tools) in zip(config.servers.items(), listings):
             for mcp_tool in mcp_tools:
                 # Filter by allowlist
                 if srv_cfg.tools is not None and mcp_tool.name not in srv_cfg.tools:
@@ -431,12 +727,17 @@ def _run_multi_upstream(config: ProxyConfig, metrics: MetricsRecorder):
                             f"Enable prefix_tools or use the 'tools' allowlist to resolve."
                         )
 
-                # Create a new Client for each ProxyTool (they manage their own sessions)
-                tool_client = _make_client(srv_cfg)
-                proxy_tool = ProxyTool.from_mcp_tool(tool_client, mcp_tool)
-                # ProxyTool is a pydantic model — create a copy with the registered name
-                proxy_tool = proxy_tool.model_copy(update={"name": registered_name})
-                server.add_tool(proxy_tool)
+                # Tools of an upstream share its Client (sessions are
+                # reentrant, so concurrent calls reuse one connection).
+                # Forwarded headers are captured when a session opens, so
+                # those upstreams keep a Client per tool to avoid widening
+                # who shares a caller's credentials.
+                tool_client = _make_client(srv_cfg) if srv_cfg.forward_headers else client
+                # The listed tool is ours to mutate; renaming it first builds
+                # the ProxyTool with its final name, without a model_copy.
+                base_name_map[registered_name] = mcp_tool.name
+                mcp_tool.name = registered_name
+                server.add_tool(ProxyTool.from_mcp_tool(tool_client, mcp_tool))
                 tool_server_map[registered_name] = server_name
 
                 logger.info(
@@ -454,6 +755,8 @@ def _run_multi_upstream(config: ProxyConfig, metrics: MetricsRecorder):
         server_configs=config.servers,
         tool_server_map=tool_server_map,
         metrics=metrics,
+        base_name_map=base_name_map,
+        result_cache_chars=config.result_cache_chars,
     ))
 
     logger.info(
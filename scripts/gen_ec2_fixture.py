@@ -14,6 +14,11 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ---------------------------------------------------------------------------
 # Deterministic seed
 # ---------------------------------------------------------------------------
@@ -140,7 +145,8 @@ def _launch_time(index: int) -> str:
     offset_minutes = rng.randint(0, 59)
     offset_seconds = rng.randint(0, 59)
     dt = BASE_TIME + timedelta(hours=offset_hours, minutes=offset_minutes, seconds=offset_seconds)
-    return dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    # BASE_TIME is UTC, so isoformat() renders the same "+00:00" suffix
+    return dt.isoformat(timespec="seconds")
 
 
 def _iam_instance_profile(app_name: str) -> dict:
@@ -253,6 +259,35 @@ STATE_CODES = {
     "terminated": 48,
 }
 
+# Sub-objects identical across instances.  They are shared by reference in
+# the response, which is only ever serialized, never mutated.
+PLACEMENTS = {
+    az: {"AvailabilityZone": az, "GroupName": "", "Tenancy": "default"}
+    for az in AZS
+}
+
+# CpuOptions - vary by instance type
+CPU_OPTIONS = {
+    "t3.micro": {"CoreCount": 1, "ThreadsPerCore": 2},
+    "t3.medium": {"CoreCount": 1, "ThreadsPerCore": 2},
+    "m5.large": {"CoreCount": 1, "ThreadsPerCore": 2},
+    "m5.xlarge": {"CoreCount": 2, "ThreadsPerCore": 2},
+    "r5.2xlarge": {"CoreCount": 4, "ThreadsPerCore": 2},
+}
+
+CAPACITY_RESERVATION_SPEC = {"CapacityReservationPreference": "open"}
+HIBERNATION_OPTIONS = {"Configured": False}
+METADATA_OPTIONS = {
+    "State": "applied",
+    "HttpTokens": "required",
+    "HttpPutResponseHopLimit": 2,
+    "HttpEndpoint": "enabled",
+    "HttpProtocolIpv6": "disabled",
+    "InstanceMetadataTags": "disabled",
+}
+ENCLAVE_OPTIONS = {"Enabled": False}
+MAINTENANCE_OPTIONS = {"AutoRecovery": "default"}
+
 
 def build_instance(index: int, instance_type: str, state: str) -> dict:
     iid = _instance_id()
@@ -319,22 +354,6 @@ def build_instance(index: int, instance_type: str, state: str) -> dict:
     # Monitoring
     monitoring = {"State": "enabled" if env == "prod" else "disabled"}
 
-    # Placement
-    placement = {
-        "AvailabilityZone": az,
-        "GroupName": "",
-        "Tenancy": "default",
-    }
-
-    # CpuOptions - vary by instance type
-    cpu_map = {
-        "t3.micro": {"CoreCount": 1, "ThreadsPerCore": 2},
-        "t3.medium": {"CoreCount": 1, "ThreadsPerCore": 2},
-        "m5.large": {"CoreCount": 1, "ThreadsPerCore": 2},
-        "m5.xlarge": {"CoreCount": 2, "ThreadsPerCore": 2},
-        "r5.2xlarge": {"CoreCount": 4, "ThreadsPerCore": 2},
-    }
-
     instance: dict = {
         "AmiLaunchIndex": 0,
         "ImageId": IMAGE_ID,
@@ -343,7 +362,7 @@ def build_instance(index: int, instance_type: str, state: str) -> dict:
         "KeyName": KEY_NAME,
         "LaunchTime": launch_time,
         "Monitoring": monitoring,
-        "Placement": placement,
+        "Placement": PLACEMENTS[az],
         "PrivateDnsName": priv_dns,
         "PrivateIpAddress": priv_ip,
         "ProductCodes": [],
@@ -369,22 +388,15 @@ def build_instance(index: int, instance_type: str, state: str) -> dict:
         "SourceDestCheck": True,
         "Tags": tags,
         "VirtualizationType": "hvm",
-        "CpuOptions": cpu_map[instance_type],
-        "CapacityReservationSpecification": {"CapacityReservationPreference": "open"},
-        "HibernationOptions": {"Configured": False},
-        "MetadataOptions": {
-            "State": "applied",
-            "HttpTokens": "required",
-            "HttpPutResponseHopLimit": 2,
-            "HttpEndpoint": "enabled",
-            "HttpProtocolIpv6": "disabled",
-            "InstanceMetadataTags": "disabled",
-        },
-        "EnclaveOptions": {"Enabled": False},
+        "CpuOptions": CPU_OPTIONS[instance_type],
+        "CapacityReservationSpecification": CAPACITY_RESERVATION_SPEC,
+        "HibernationOptions": HIBERNATION_OPTIONS,
+        "MetadataOptions": METADATA_OPTIONS,
+        "EnclaveOptions": ENCLAVE_OPTIONS,
         "PlatformDetails": "Linux/UNIX",
         "UsageOperation": "RunInstances",
         "UsageOperationUpdateTime": launch_time,
-        "MaintenanceOptions": {"AutoRecovery": "default"},
+        "MaintenanceOptions": MAINTENANCE_OPTIONS,
         "CurrentInstanceBootMode": "legacy-bios",
     }
 
@@ -437,15 +449,30 @@ def build_response() -> dict:
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
+def _dumps(obj: dict) -> bytes:
+    """Serialize with a 2-space indent, via orjson when it is installed.
+
+    For this all-ASCII fixture orjson's output is byte-identical to
+    ``json.dumps(obj, indent=2)``.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
 def main() -> None:
     response = build_response()
     output_path = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "aws_ec2_instances.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    json_text = json.dumps(response, indent=2)
-    output_path.write_text(json_text + "\n")
+    json_bytes = _dumps(response)
+    # A buffer larger than the payload coalesces both writes into one,
+    # without copying the payload to append the newline.
+    with output_path.open("wb", buffering=1 << 20) as f:
+        f.write(json_bytes)
+        f.write(b"\n")
 
-    size_kb = len(json_text) / 1024
+    size_kb = len(json_bytes) / 1024
     num_instances = sum(len(r["Instances"]) for r in response["Reservations"])
     num_reservations = len(response["Reservations"])
 
@@ -453,7 +480,7 @@ def main() -> None:
     print(f"  Reservations: {num_reservations}")
     print(f"  Instances:    {num_instances}")
     print(f"  File size:    {size_kb:.1f} KB")
-    print(f"  Characters:   {len(json_text):,}")
+    print(f"  Characters:   {len(json_bytes):,}")
 
 
 if __name__ == "__main__":
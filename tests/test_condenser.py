@@ -5,7 +5,7 @@ from collections import OrderedDict
 
 import pytest
 
-from mcp_condenser.condenser import classify, flatten, fmt, find_identity_column, is_homogeneous_array, is_kv_array, pivot_kv_fields, condense_text, toon_encode, condense_json, toon_encode_json, truncate_to_token_limit, count_tokens
+from mcp_condenser.condenser import classify, flatten, fmt, find_identity_column, is_homogeneous_array, is_kv_array, pivot_kv_fields, condense_text, toon_encode, condense_json, toon_encode_json, truncate_to_token_limit, count_tokens, count_tokens_batch, stats, token_stats
 from mcp_condenser.parsers import parse_input
 
 
@@ -85,6 +85,21 @@ class TestFlatten:
         result = flatten({})
         assert result == OrderedDict()
 
+    def test_key_order_is_depth_first(self):
+        result = flatten({"a": {"b": 1, "c": {"d": 2}}, "e": 3, "f": {"g": 4}})
+        assert list(result) == ["a.b", "a.c.d", "e", "f.g"]
+
+    def test_empty_nested_dict_dropped(self):
+        assert flatten({"a": {}, "b": 1}) == {"b": 1}
+
+    def test_deep_nesting(self):
+        obj = leaf = {}
+        for _ in range(2000):
+            leaf["n"] = {}
+            leaf = leaf["n"]
+        leaf["v"] = 1
+        assert flatten(obj) == {".".join(["n"] * 2000 + ["v"]): 1}
+
 
 class TestIsHomogeneousArray:
     def test_uniform_dicts(self):
@@ -110,6 +125,15 @@ class TestIsHomogeneousArray:
         # 2 out of 4 union keys shared = 50%, below threshold
         assert is_homogeneous_array(arr) is False
 
+    def test_nested_keys_count_and_lists_ignored(self):
+        arr = [
+            {"a": 1, "m": {"x": 1}, "tags": [1]},
+            {"a": 2, "m": {"x": 2}, "other": [2]},
+        ]
+        assert is_homogeneous_array(arr) is True
+        # Only list values: no scalar columns to tabulate
+        assert is_homogeneous_array([{"t": [1]}, {"t": [2]}]) is False
+
 
 class TestCondenseText:
     def test_simple_object(self):
@@ -368,6 +392,95 @@ class TestTruncateToTokenLimit:
         result = truncate_to_token_limit(text, tokens)
         assert result == text
 
+    def test_truncated_prefix_is_clean(self):
+        """Truncation keeps a prefix of the input and never splits a character."""
+        text = "héllo wörld ü€ " * 300
+        result = truncate_to_token_limit(text, 120)
+        body = result.split("\n\n[truncated:")[0]
+        assert text.startswith(body)
+        assert "\ufffd" not in result
+        assert count_tokens(result) <= 130
+
+    def test_prefix_shrinks_when_recount_overshoots(self, monkeypatch):
+        """A cut whose re-count exceeds the limit is shortened a token at a time."""
+        from mcp_condenser import condenser
+        if not hasattr(condenser, "_enc"):
+            pytest.skip("tiktoken not available")
+
+        # Tokens straddle the multi-byte "€" (e2 82 ac), as real BPE tokens can
+        chunks = [b"a", b"b\xe2", b"\x82\xac", b"c\xe2\x82", b"\xac"]
+
+        class FakeEncoding:
+            def encode_ordinary(self, text):
+                return list(range(len(chunks)))
+
+            def decode_bytes(self, ids):
+                return b"".join(chunks[i] for i in ids)
+
+        monkeypatch.setattr(condenser, "_enc", FakeEncoding())
+        # Re-tokenizing counts bytes, so "ab€" (5) overshoots a 3-token cut
+        monkeypatch.setattr(condenser, "count_tokens", lambda t: len(t.encode()))
+        assert condenser._token_prefix("ab€c€", 3) == ("ab", 2)
+
+    def test_known_token_count_used(self):
+        """A supplied token count decides the fast path without re-tokenizing."""
+        text = "word " * 500
+        assert truncate_to_token_limit(text, 50, token_count=10) is text
+        result = truncate_to_token_limit(text, 50, token_count=count_tokens(text))
+        assert result == truncate_to_token_limit(text, 50)
+
+
+class TestCountTokensBatch:
+    def test_matches_per_item_counts(self):
+        texts = ["hello world", "", "ünïcödé text", '{"a": [1, 2, 3]}']
+        assert count_tokens_batch(texts) == [count_tokens(t) for t in texts]
+
+    def test_empty_batch(self):
+        assert count_tokens_batch([]) == []
+
+
+class TestCountTokensCache:
+    def test_short_text_memoized(self):
+        from mcp_condenser import condenser
+        if not hasattr(condenser, "_count_short"):
+            pytest.skip("tiktoken not available")
+        text = "Error: upstream timed out (cache test)"
+        first = count_tokens(text)
+        hits = condenser._count_short.cache_info().hits
+        assert count_tokens(text) == first
+        assert condenser._count_short.cache_info().hits == hits + 1
+
+    def test_special_token_text_counted_as_plain_text(self):
+        text = "log tail: <|endoftext|> " * 20
+        assert count_tokens(text) > 0
+        assert count_tokens_batch([text]) == [count_tokens(text)]
+
+    def test_long_text_counts_match_batch(self):
+        text = "word " * 200
+        assert count_tokens(text) == count_tokens_batch([text])[0]
+
+
+class TestStats:
+    def test_counts_both_sides(self):
+        s = stats("hello world, hello world", "hello")
+        assert s["orig_tok"] == count_tokens("hello world, hello world")
+        assert s["cond_tok"] == count_tokens("hello")
+
+    def test_known_counts_used(self):
+        s = stats("hello world", "hi", orig_tok=100, cond_tok=25)
+        assert (s["orig_tok"], s["cond_tok"], s["tok_pct"]) == (100, 25, 75.0)
+
+    def test_token_stats_matches_stats(self):
+        orig, cond = "hello world, hello world", "hello"
+        s = stats(orig, cond)
+        t = token_stats(orig, cond)
+        assert (t.orig_tok, t.cond_tok, t.tok_pct) == (s["orig_tok"], s["cond_tok"], s["tok_pct"])
+
+    def test_empty_original_pct_is_float(self):
+        t = token_stats("", "", orig_tok=0, cond_tok=0)
+        assert t.tok_pct == 0.0
+        assert isinstance(t.tok_pct, float)
+
 
 class TestFindIdentityColumn:
     def test_prefers_higher_cardinality_name(self):
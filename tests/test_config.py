@@ -69,6 +69,19 @@ class TestFromFile:
         config = ProxyConfig.from_file(str(cfg_file))
         assert config.servers["s"].tools == ["a", "b"]
 
+    def test_header_names_lowercased(self, tmp_path):
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_text(json.dumps({
+            "servers": {"s": {
+                "url": "http://localhost/mcp",
+                "headers": {"X-Api-Key": "Secret"},
+                "forward_headers": {"X-User-Token": "Authorization"},
+            }}
+        }))
+        srv = ProxyConfig.from_file(str(cfg_file)).servers["s"]
+        assert srv.headers == {"x-api-key": "Secret"}
+        assert srv.forward_headers == {"x-user-token": "authorization"}
+
 
 class TestFromEnv:
     def test_backward_compat(self, monkeypatch):
@@ -111,6 +124,42 @@ class TestFromEnv:
         assert srv.max_token_limit == 10000
         assert srv.tool_token_limits == {"a": 1000, "b": 2000}
 
+    def test_repeated_calls_return_independent_lists(self, monkeypatch):
+        monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
+        monkeypatch.setenv("CONDENSE_TOOLS", "a,b")
+        monkeypatch.setenv("TOOL_TOKEN_LIMITS", "a:1000")
+        first = ProxyConfig.from_env().servers["default"]
+        first.tools.append("c")
+        first.tool_token_limits["b"] = 2000
+        second = ProxyConfig.from_env().servers["default"]
+        assert second.tools == ["a", "b"]
+        assert second.tool_token_limits == {"a": 1000}
+
+    def test_upstream_header_names_lowercased(self, monkeypatch):
+        monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
+        monkeypatch.setenv("UPSTREAM_MCP_HEADERS", '{"Authorization": "Bearer Abc"}')
+        srv = ProxyConfig.from_env().servers["default"]
+        assert srv.headers == {"authorization": "Bearer Abc"}
+
+    def test_boolean_env_values(self, monkeypatch):
+        monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
+        monkeypatch.setenv("TOON_FALLBACK", " No ")
+        monkeypatch.setenv("REVERT_IF_LARGER", "YES")
+        srv = ProxyConfig.from_env().servers["default"]
+        assert srv.toon_fallback is False
+        assert srv.revert_if_larger is True
+
+    def test_empty_boolean_env_uses_default(self, monkeypatch):
+        monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
+        monkeypatch.setenv("TOON_FALLBACK", "")
+        monkeypatch.setenv("REVERT_IF_LARGER", " ")
+        monkeypatch.setenv("METRICS_ENABLED", "")
+        config = ProxyConfig.from_env()
+        srv = config.servers["default"]
+        assert srv.toon_fallback is True
+        assert srv.revert_if_larger is False
+        assert config.metrics_enabled is False
+
 
 class TestMetricsConfig:
     def test_defaults(self):
@@ -177,6 +226,33 @@ class TestMetricsConfig:
         assert config.metrics_port == 7777
 
 
+class TestResultCacheConfig:
+    def test_default(self):
+        assert ProxyConfig(servers={}).result_cache_chars == 2_000_000
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
+        monkeypatch.setenv("RESULT_CACHE_CHARS", "0")
+        assert ProxyConfig.from_env().result_cache_chars == 0
+
+    def test_from_file(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RESULT_CACHE_CHARS", "5")
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_text(json.dumps({
+            "global": {"result_cache_chars": 1000},
+            "servers": {"s": {"url": "http://localhost/mcp"}},
+        }))
+        assert ProxyConfig.from_file(str(cfg_file)).result_cache_chars == 1000
+
+    def test_from_file_falls_back_to_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RESULT_CACHE_CHARS", "0")
+        cfg_file = tmp_path / "config.json"
+        cfg_file.write_text(json.dumps({
+            "servers": {"s": {"url": "http://localhost/mcp"}},
+        }))
+        assert ProxyConfig.from_file(str(cfg_file)).result_cache_chars == 0
+
+
 class TestHeuristicsConfig:
     def test_from_env_parses_heuristics(self, monkeypatch):
         monkeypatch.setenv("UPSTREAM_MCP_URL", "http://localhost/mcp")
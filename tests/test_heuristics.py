@@ -375,10 +375,16 @@ class TestPivotKeyValueToggle:
             url="http://localhost/mcp",
             heuristics={"elide_timestaps": False},  # typo
         )
-        mw = CondenserMiddleware(server_configs={"default": cfg})
-        data = json.dumps([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
         with pytest.raises(TypeError, match="Valid heuristic names are"):
-            mw._condense_item(data, "some_tool", cfg)
+            CondenserMiddleware(server_configs={"default": cfg})
+
+    def test_tool_heuristics_typo_raises_at_startup(self):
+        cfg = ServerConfig(
+            url="http://localhost/mcp",
+            tool_heuristics={"get_pods": {"max_tupel_size": 3}},  # typo
+        )
+        with pytest.raises(TypeError, match="Valid heuristic names are"):
+            CondenserMiddleware(server_configs={"default": cfg})
 
 
 class TestWideTableVertical:
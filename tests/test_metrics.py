@@ -4,7 +4,7 @@ import time
 
 from prometheus_client import CollectorRegistry
 
-from mcp_condenser.metrics import NoopRecorder, PrometheusRecorder, timer
+from mcp_condenser.metrics import NOOP_RECORDER, NoopRecorder, PrometheusRecorder, create_recorder, timer
 
 
 class TestNoopRecorder:
@@ -18,6 +18,10 @@ class TestNoopRecorder:
         r.record_processing_seconds("tool", "server", 1.23)
         r.record_truncation("tool", "server")
 
+    def test_disabled_factory_returns_shared_instance(self):
+        assert create_recorder(enabled=False) is NOOP_RECORDER
+        assert create_recorder(enabled=False) is create_recorder(enabled=False)
+
 
 class TestPrometheusRecorder:
     def _make_recorder(self):
@@ -95,6 +99,23 @@ class TestPrometheusRecorder:
         ) == 1.0
 
 
+    def test_label_children_cached(self, monkeypatch):
+        rec, registry = self._make_recorder()
+        calls = []
+        real_labels = rec.truncations_total.labels
+        monkeypatch.setattr(
+            rec.truncations_total, "labels",
+            lambda *a, **kw: calls.append(a) or real_labels(*a, **kw),
+        )
+        rec.record_truncation("t", "s")
+        rec.record_truncation("t", "s")
+        rec.record_truncation("t", "other")
+        assert calls == [("t", "s"), ("t", "other")]
+        assert registry.get_sample_value(
+            "condenser_truncations_total", {"tool": "t", "server": "s"}
+        ) == 2.0
+
+
 class TestTimer:
     def test_timer_returns_elapsed(self):
         with timer() as elapsed:
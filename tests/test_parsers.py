@@ -4,7 +4,10 @@ import pytest
 
 from mcp_condenser.parsers import (
     PARSER_REGISTRY,
+    InputFormat,
     Parser,
+    _guess_format,
+    is_plain_text,
     parse_input,
     register_parser,
 )
@@ -19,6 +22,15 @@ class TestParserRegistry:
     def test_registry_has_at_least_two(self):
         assert len(PARSER_REGISTRY) >= 2
 
+    def test_builtin_names_are_input_formats(self):
+        builtin = [p.name for p in PARSER_REGISTRY if isinstance(p.name, InputFormat)]
+        assert builtin == list(InputFormat)
+
+    def test_input_format_compares_as_str(self):
+        _, fmt = parse_input('{"a": 1}')
+        assert fmt is InputFormat.JSON
+        assert fmt == "json"
+
 
 class TestRegisterParser:
     def test_append(self):
@@ -121,6 +133,148 @@ class TestParseInputNormalize:
             PARSER_REGISTRY.pop()
 
 
+class TestJsonParser:
+    def test_big_int_exact(self):
+        data, fmt = parse_input('{"id": 123456789012345678901234567890}')
+        assert fmt == "json"
+        assert data["id"] == 123456789012345678901234567890
+
+    @pytest.mark.parametrize("value", [
+        -(2**63) - 1, -(2**63), 2**63 - 1, 2**64 - 1, 2**64,
+    ])
+    def test_64_bit_edges_exact_with_orjson(self, value):
+        pytest.importorskip("orjson")
+        data, fmt = parse_input(f'{{"id": {value}}}')
+        assert fmt == "json"
+        assert data["id"] == value
+        assert isinstance(data["id"], int)
+
+    def test_nan_accepted(self):
+        data, fmt = parse_input('{"ratio": NaN}')
+        assert fmt == "json"
+        assert data["ratio"] != data["ratio"]
+
+    def test_unicode(self):
+        data, _ = parse_input('{"név": "érték", "emoji": "\\ud83d\\ude00"}')
+        assert data == {"név": "érték", "emoji": "\U0001F600"}
+
+
+class TestGuessFormat:
+    @pytest.mark.parametrize("text,expected", [
+        ('{"a": 1}', InputFormat.JSON),
+        ("  [1, 2]", InputFormat.JSON),
+        ("<root><a>1</a></root>", InputFormat.XML),
+        ('<?xml version="1.0"?><root/>', InputFormat.XML),
+        ("name: alice\nage: 30\n", InputFormat.YAML),
+        ("---\na: 1\n", InputFormat.YAML),
+        ("- a\n- b\n", InputFormat.YAML),
+        ("name,age\nalice,30\n", InputFormat.CSV),
+        ("name\tage\nalice\t30\n", InputFormat.CSV),
+    ])
+    def test_guesses(self, text, expected):
+        assert _guess_format(text) is expected
+
+    @pytest.mark.parametrize("text", [
+        "just a string",
+        "123",
+        "a, b: c\nd, e: f\n",  # YAML mapping, not CSV
+        "name,age",  # no second line
+    ])
+    def test_no_guess(self, text):
+        assert _guess_format(text) is None
+
+    def test_yaml_mapping_with_commas_stays_yaml(self):
+        data, fmt = parse_input("a, b: c\nd, e: f\n")
+        assert fmt == "yaml"
+        assert data == {"a, b": "c", "d, e": "f"}
+
+    def test_guess_does_not_jump_custom_priority_parser(self):
+        calls = []
+
+        def _try(text):
+            calls.append(text)
+            return None
+
+        p = Parser(name="custom_first", try_parse=_try)
+        register_parser(p, priority=0)
+        try:
+            _, fmt = parse_input("<root><a>1</a></root>")
+            assert fmt == "xml"
+            assert len(calls) == 1
+        finally:
+            PARSER_REGISTRY.pop(0)
+
+
+class TestPlainTextShortCircuit:
+    def test_plain_text_skips_other_parsers(self, monkeypatch):
+        import mcp_condenser.parsers as parsers_mod
+
+        def _fail(text):
+            pytest.fail(f"{text!r} reached a non-JSON parser")
+
+        monkeypatch.setattr(parsers_mod, "PARSER_REGISTRY", [
+            p if p.name == InputFormat.JSON else Parser(name=p.name, try_parse=_fail)
+            for p in PARSER_REGISTRY
+        ])
+        with pytest.raises(ValueError, match="yaml"):
+            parse_input("connection refused by upstream")
+
+    @pytest.mark.parametrize("text,expected", [
+        ("123", 123),
+        ("true", True),
+        ('"quoted"', "quoted"),
+    ])
+    def test_json_scalars_still_parse(self, text, expected):
+        assert parse_input(text) == (expected, "json")
+
+    def test_custom_parser_still_tried(self):
+        p = Parser(name="shout", try_parse=lambda t: ({"msg": t}, "shout") if t.isupper() else None)
+        register_parser(p)
+        try:
+            assert parse_input("HELLO THERE") == ({"msg": "HELLO THERE"}, "shout")
+        finally:
+            PARSER_REGISTRY.pop()
+
+    def test_yaml_complex_key_not_skipped(self):
+        data, fmt = parse_input("? a\n")
+        assert fmt == "yaml"
+        assert data == {"a": None}
+
+
+class TestIsPlainText:
+    @pytest.mark.parametrize("text", [
+        "connection refused by upstream",
+        "OK",
+        "",
+        "   ",
+        "Permission denied",
+    ])
+    def test_plain(self, text):
+        assert is_plain_text(text)
+        with pytest.raises(ValueError):
+            parse_input(text)
+
+    @pytest.mark.parametrize("text", [
+        '{"a": 1}',
+        "123",
+        "true",
+        "the server said no",  # could start a JSON literal; left to the parser
+        "name: alice\n",
+        "a,b\n1,2\n",
+        "<root/>",
+    ])
+    def test_not_plain(self, text):
+        assert not is_plain_text(text)
+
+    def test_custom_parser_disables_check(self):
+        p = Parser(name="anything", try_parse=lambda t: None)
+        register_parser(p)
+        try:
+            assert not is_plain_text("OK")
+        finally:
+            PARSER_REGISTRY.pop()
+
+
 class TestParseInputError:
     def test_error_lists_format_names(self):
         """ValueError message includes registered format names."""
@@ -1,13 +1,19 @@
 """Unit tests for CondenserMiddleware."""
 
+import asyncio
 import json
+import logging
+from types import SimpleNamespace
 
 import pytest
+from fastmcp.tools.tool import ToolResult
+from mcp.types import ImageContent, TextContent
 from prometheus_client import CollectorRegistry
 
+from mcp_condenser.condenser import count_tokens
 from mcp_condenser.config import ProxyConfig, ServerConfig
 from mcp_condenser.metrics import PrometheusRecorder
-from mcp_condenser.proxy import CondenserMiddleware
+from mcp_condenser.proxy import CondenserMiddleware, _ForwardingTransport, _ResultCache, _configure_logging, _make_client
 
 
 def _make_middleware(
@@ -27,6 +33,61 @@ def _make_middleware(
     )
 
 
+class TestForwardingTransportHeaders:
+    def _headers(self, monkeypatch, incoming, **kwargs):
+        import mcp_condenser.proxy as proxy_mod
+
+        monkeypatch.setattr(proxy_mod, "get_http_headers", lambda: incoming)
+        transport = _ForwardingTransport(url="http://upstream/mcp", **kwargs)
+        return transport._outgoing_headers()
+
+    def test_translates_mapped_headers_only(self, monkeypatch):
+        headers = self._headers(
+            monkeypatch,
+            {"x-user-token": "abc", "cookie": "secret"},
+            forward_headers={"X-User-Token": "Authorization"},
+        )
+        assert headers == {"authorization": "abc"}
+
+    def test_static_headers_override_translated(self, monkeypatch):
+        headers = self._headers(
+            monkeypatch,
+            {"x-user-token": "abc"},
+            headers={"authorization": "static"},
+            forward_headers={"x-user-token": "authorization"},
+        )
+        assert headers == {"authorization": "static"}
+
+    def test_static_header_case_insensitive_override(self, monkeypatch):
+        headers = self._headers(
+            monkeypatch,
+            {"x-user-token": "abc"},
+            headers={"Authorization": "static"},
+            forward_headers={"x-user-token": "authorization"},
+        )
+        assert headers == {"authorization": "static"}
+
+    def test_missing_incoming_header_skipped(self, monkeypatch):
+        headers = self._headers(
+            monkeypatch, {},
+            headers={"x-static": "1"},
+            forward_headers={"x-user-token": "authorization"},
+        )
+        assert headers == {"x-static": "1"}
+
+
+class TestMakeClient:
+    @pytest.mark.parametrize("kwargs,transport", [
+        ({"url": "http://up/mcp"}, "StreamableHttpTransport"),
+        ({"url": "http://up/sse"}, "SSETransport"),
+        ({"url": "http://up/mcp", "headers": {"x-a": "1"}}, "StreamableHttpTransport"),
+        ({"url": "http://up/mcp", "forward_headers": {"x-a": "x-b"}}, "_ForwardingTransport"),
+    ])
+    def test_transport_choice(self, kwargs, transport):
+        client = _make_client(ServerConfig(**kwargs))
+        assert type(client.transport).__name__ == transport
+
+
 class TestResolveServerConfig:
     def test_single_upstream(self):
         mw = _make_middleware()
@@ -54,6 +115,22 @@ class TestResolveServerConfig:
         mw = CondenserMiddleware(server_configs=configs, tool_server_map=tool_map)
         assert mw._resolve_server_config("unknown_tool") is None
 
+    def test_tool_mapped_after_construction(self):
+        configs = {"k8s": ServerConfig(url="http://k8s/mcp")}
+        tool_map: dict[str, str] = {}
+        mw = CondenserMiddleware(server_configs=configs, tool_server_map=tool_map)
+        assert mw._resolve_server("k8s_get_pods") == ("unknown", None)
+        tool_map["k8s_get_pods"] = "k8s"
+        assert mw._resolve_server("k8s_get_pods") == ("k8s", configs["k8s"])
+
+    def test_multiple_configs_without_map(self):
+        configs = {
+            "a": ServerConfig(url="http://a/mcp"),
+            "b": ServerConfig(url="http://b/mcp"),
+        }
+        mw = CondenserMiddleware(server_configs=configs)
+        assert mw._resolve_server("tool") == ("a", None)
+
 
 class TestBaseToolName:
     def test_strips_prefix_in_multi(self):
@@ -65,6 +142,26 @@ class TestBaseToolName:
         mw = _make_middleware()
         assert mw._base_tool_name("get_pods") == "get_pods"
 
+    def test_map_filled_after_construction(self):
+        tool_map: dict[str, str] = {}
+        mw = _make_middleware(tool_server_map=tool_map)
+        assert mw._base_tool_name("k8s_get_pods") == "k8s_get_pods"
+        tool_map["k8s_get_pods"] = "k8s"
+        assert mw._base_tool_name("k8s_get_pods") == "get_pods"
+        assert mw._base_tool_name("k8s_get_pods") == "get_pods"
+
+    def test_base_name_map_used(self):
+        """Unprefixed tools whose name happens to start with the server name."""
+        tool_map: dict[str, str] = {}
+        base_map: dict[str, str] = {}
+        mw = CondenserMiddleware(
+            server_configs={"k8s": ServerConfig(url="http://k8s/mcp")},
+            tool_server_map=tool_map, base_name_map=base_map,
+        )
+        tool_map["k8s_version"] = "k8s"
+        base_map["k8s_version"] = "k8s_version"
+        assert mw._base_tool_name("k8s_version") == "k8s_version"
+
 
 class TestCondenseItem:
     def test_condense_mode(self):
@@ -73,7 +170,7 @@ class TestCondenseItem:
         text = json.dumps({"name": "test", "value": 42})
         result = mw._condense_item(text, "test_tool", cfg)
         assert result is not None
-        condensed, mode = result
+        condensed, mode, _ = result
         assert mode == "condense"
         assert "test" in condensed
 
@@ -83,7 +180,7 @@ class TestCondenseItem:
         text = json.dumps({"name": "test", "value": 42})
         result = mw._condense_item(text, "special_tool", cfg)
         assert result is not None
-        condensed, mode = result
+        condensed, mode, _ = result
         assert mode == "toon_only"
         assert "test" in condensed
 
@@ -93,7 +190,7 @@ class TestCondenseItem:
         text = json.dumps({"name": "test"})
         result = mw._condense_item(text, "unmatched_tool", cfg)
         assert result is not None
-        _, mode = result
+        _, mode, _ = result
         assert mode == "toon_fallback"
 
     def test_passthrough_no_condense(self):
@@ -119,6 +216,25 @@ class TestCondenseItem:
         result = mw._condense_item(text, "tool", cfg)
         assert result is None
 
+    def test_min_token_threshold_checked_before_parsing(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("parse_input should not run")
+
+        monkeypatch.setattr(proxy_mod, "parse_input", _fail)
+        mw = _make_middleware(min_token_threshold=50)
+        cfg = mw._resolve_server_config("tool")
+        assert mw._condense_item(json.dumps({"small": "data"}), "tool", cfg) is None
+        # Non-ASCII text goes through the tokenizer instead of the length bound
+        assert mw._condense_item(json.dumps({"café": "données"}, ensure_ascii=False), "tool", cfg) is None
+
+    def test_min_token_threshold_allows_large(self):
+        mw = _make_middleware(min_token_threshold=10)
+        cfg = mw._resolve_server_config("tool")
+        text = json.dumps({"items": [{"name": f"item-{i}", "value": i} for i in range(20)]})
+        assert mw._condense_item(text, "tool", cfg) is not None
+
     def test_revert_if_larger(self):
         """When condensed output is larger, revert."""
         mw = _make_middleware(revert_if_larger=True)
@@ -132,6 +248,138 @@ class TestCondenseItem:
         assert result is None or isinstance(result, tuple)
 
 
+class TestPlainTextSkip:
+    def test_plain_text_skips_parse(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        monkeypatch.setattr(
+            proxy_mod, "parse_input", lambda *a, **kw: pytest.fail("parse_input called"),
+        )
+        registry = CollectorRegistry()
+        mw = _make_middleware(metrics=PrometheusRecorder(registry=registry))
+        cfg = mw._resolve_server_config("tool")
+        assert mw._condense_item("upstream timed out", "tool", cfg) is None
+        assert registry.get_sample_value(
+            "condenser_requests_total",
+            {"tool": "tool", "server": "default", "mode": "passthrough"},
+        ) == 1.0
+
+
+class TestResultCache:
+    def _counting_parse(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        calls = []
+        real = proxy_mod.parse_input
+
+        def parse(*a, **kw):
+            calls.append(a[0])
+            return real(*a, **kw)
+
+        monkeypatch.setattr(proxy_mod, "parse_input", parse)
+        return calls
+
+    def test_repeated_text_parsed_once(self, monkeypatch):
+        calls = self._counting_parse(monkeypatch)
+        registry = CollectorRegistry()
+        mw = _make_middleware(metrics=PrometheusRecorder(registry=registry))
+        cfg = mw._resolve_server_config("tool")
+        text = json.dumps([{"id": i, "name": f"n{i}"} for i in range(5)])
+        first = mw._condense_item(text, "tool", cfg)
+        assert mw._condense_item(text, "tool", cfg) == first
+        assert len(calls) == 1
+        # Metrics still count every item
+        assert registry.get_sample_value(
+            "condenser_requests_total",
+            {"tool": "tool", "server": "default", "mode": "condense"},
+        ) == 2.0
+
+    def test_disabled(self, monkeypatch):
+        calls = self._counting_parse(monkeypatch)
+        mw = CondenserMiddleware(
+            server_configs={"default": ServerConfig(url="http://localhost/mcp")},
+            result_cache_chars=0,
+        )
+        cfg = mw._resolve_server_config("tool")
+        text = json.dumps([{"id": 1}, {"id": 2}])
+        mw._condense_item(text, "tool", cfg)
+        mw._condense_item(text, "tool", cfg)
+        assert len(calls) == 2
+
+    def test_keyed_by_tool(self, monkeypatch):
+        calls = self._counting_parse(monkeypatch)
+        mw = _make_middleware(toon_only_tools=["raw"])
+        cfg = mw._resolve_server_config("tool")
+        text = json.dumps([{"id": 1, "v": "a"}, {"id": 2, "v": "a"}])
+        assert mw._condense_item(text, "tool", cfg)[1] == "condense"
+        assert mw._condense_item(text, "raw", cfg)[1] == "toon_only"
+        assert len(calls) == 2
+
+    def test_evicts_oldest_over_budget(self):
+        cache = _ResultCache(max_chars=10)
+        cache.put(("t", "a"), "A", 4)
+        cache.put(("t", "b"), "B", 4)
+        assert cache.get(("t", "a")) == "A"  # now most recently used
+        cache.put(("t", "c"), "C", 4)
+        assert cache.get(("t", "b")) is None
+        assert cache.get(("t", "a")) == "A"
+        assert cache.get(("t", "c")) == "C"
+
+    def test_oversized_entry_not_stored(self):
+        cache = _ResultCache(max_chars=10)
+        cache.put(("t", "big"), "X", 11)
+        assert cache.get(("t", "big")) is None
+
+
+class TestResolveTool:
+    def test_cached_per_tool(self):
+        mw = _make_middleware(toon_only_tools=["special"])
+        cfg = mw._resolve_server_config("special")
+        first = mw._resolve_tool("special", cfg)
+        assert first.mode == "toon_only"
+        assert mw._resolve_tool("special", cfg) is first
+
+    def test_heuristics_shared_across_tools(self):
+        mw = _make_middleware(tool_heuristics={"special": {"elide_timestamps": False}})
+        cfg = mw._resolve_server_config("a")
+        h_a = mw._resolve_tool("a", cfg).heuristics
+        assert mw._resolve_tool("b", cfg).heuristics is h_a
+        special = mw._resolve_tool("special", cfg).heuristics
+        assert special is not h_a
+        assert special.elide_timestamps is False
+
+    def test_token_limit_per_tool_overrides_server(self):
+        mw = _make_middleware(max_token_limit=500, tool_token_limits={"big": 5000})
+        cfg = mw._resolve_server_config("big")
+        assert mw._resolve_tool("big", cfg).token_limit == 5000
+        assert mw._resolve_tool("other", cfg).token_limit == 500
+
+    def test_unmapped_tool_not_cached(self):
+        """tool_server_map is filled after construction in multi-upstream mode."""
+        configs = {"k8s": ServerConfig(url="http://k8s/mcp")}
+        tool_map: dict[str, str] = {}
+        mw = CondenserMiddleware(server_configs=configs, tool_server_map=tool_map)
+        cfg = configs["k8s"]
+        assert mw._resolve_tool("k8s_get_pods", cfg).base_name == "k8s_get_pods"
+        tool_map["k8s_get_pods"] = "k8s"
+        resolved = mw._resolve_tool("k8s_get_pods", cfg)
+        assert resolved.base_name == "get_pods"
+        assert resolved.server_name == "k8s"
+
+    def test_no_match_skips_parsing(self):
+        registry = CollectorRegistry()
+        mw = _make_middleware(
+            metrics=PrometheusRecorder(registry=registry),
+            tools=["other"], toon_fallback=False,
+        )
+        cfg = mw._resolve_server_config("tool")
+        assert mw._condense_item(json.dumps({"a": 1}), "tool", cfg) is None
+        assert registry.get_sample_value(
+            "condenser_requests_total",
+            {"tool": "tool", "server": "default", "mode": "passthrough"},
+        ) == 1.0
+
+
 class TestShouldProcess:
     def test_condense_all(self):
         mw = _make_middleware()
@@ -205,6 +453,24 @@ class TestMetricsRecording:
             {"tool": "tool", "server": "default", "mode": "skipped"},
         ) == 1.0
 
+    def test_below_threshold_passthrough_keeps_label(self):
+        mw, reg = self._make_with_metrics(
+            min_token_threshold=999999, tools=["other"], toon_fallback=False,
+        )
+        cfg = mw._resolve_server_config("tool")
+        assert mw._condense_item(json.dumps({"small": "data"}), "tool", cfg) is None
+        assert mw._condense_item("upstream timed out", "other", cfg) is None
+
+        for tool in ("tool", "other"):
+            assert reg.get_sample_value(
+                "condenser_requests_total",
+                {"tool": tool, "server": "default", "mode": "passthrough"},
+            ) == 1.0
+            assert reg.get_sample_value(
+                "condenser_requests_total",
+                {"tool": tool, "server": "default", "mode": "skipped"},
+            ) is None
+
     def test_non_json_records_passthrough(self):
         mw, reg = self._make_with_metrics()
         cfg = mw._resolve_server_config("tool")
@@ -309,7 +575,7 @@ class TestUnprefixedToolServerMap:
         text = json.dumps({"name": "test", "value": 42})
         result = mw._condense_item(text, "get_pods", cfg)
         assert result is not None
-        condensed, mode = result
+        condensed, mode, _ = result
         assert mode == "condense"
 
 
@@ -419,7 +685,7 @@ class TestProfileHeuristicsMerge:
         data = json.dumps(rows)
         result = mw._condense_item(data, "test_tool", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # With balanced profile (threshold=20, format=split), wide table should be split
         assert "---" in condensed
 
@@ -434,7 +700,7 @@ class TestProfileHeuristicsMerge:
         data = json.dumps(rows)
         result = mw._condense_item(data, "test_tool", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # Compact profile has threshold=0 (disabled), so no split sub-tables
         # It should be a single table block
         assert "._misc" not in condensed
@@ -451,7 +717,7 @@ class TestProfileHeuristicsMerge:
         data = json.dumps(rows)
         result = mw._condense_item(data, "test_tool", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # Server override disabled wide table, no split sub-tables
         assert "._misc" not in condensed
 
@@ -469,7 +735,7 @@ class TestProfileHeuristicsMerge:
         data = json.dumps(rows)
         result = mw._condense_item(data, "test_tool", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # Tool override sets threshold=5, format=split — columns > 5, should split
         assert ".grp" in condensed
 
@@ -492,7 +758,7 @@ class TestToolHeuristicsMerge:
         ])
         result = mw._condense_item(data, "get_pods", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # Tool override sets elide_timestamps=False, so timestamps should appear
         assert "2024-01-01T00:00:00Z" in condensed
 
@@ -511,7 +777,7 @@ class TestToolHeuristicsMerge:
         ])
         result = mw._condense_item(data, "some_tool", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # With elide_timestamps=False, timestamps should be in output
         assert "2024-01-01T00:00:00Z" in condensed
 
@@ -530,7 +796,7 @@ class TestToolHeuristicsMerge:
         ])
         result = mw._condense_item(data, "get_pods", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         # Tool override sets elide_timestamps=False, so timestamps should appear
         assert "2024-01-01T00:00:00Z" in condensed
 
@@ -548,7 +814,7 @@ class TestFormatHintFlow:
         text = json.dumps({"name": "test", "value": 42})
         result = mw._condense_item(text, "test_tool", cfg)
         assert result is not None
-        condensed, mode = result
+        condensed, mode, _ = result
         assert mode == "condense"
         assert "test" in condensed
 
@@ -563,7 +829,7 @@ class TestFormatHintFlow:
         text = json.dumps({"name": "test", "value": 42})
         result = mw._condense_item(text, "get_data", cfg)
         assert result is not None
-        condensed, mode = result
+        condensed, mode, _ = result
         assert mode == "condense"
         assert "test" in condensed
 
@@ -577,5 +843,248 @@ class TestFormatHintFlow:
         text = "name: test\nvalue: 42\n"
         result = mw._condense_item(text, "get_config", cfg)
         assert result is not None
-        condensed, _ = result
+        condensed, _, _ = result
         assert "test" in condensed
+
+
+class TestOnListTools:
+    def _list(self, mw, tools):
+        async def call_next(context):
+            return tools
+
+        return asyncio.run(mw.on_list_tools(SimpleNamespace(), call_next))
+
+    def _tool(self, name):
+        return SimpleNamespace(name=name, output_schema={"type": "object"})
+
+    def test_clears_output_schema_for_processed_tools(self):
+        mw = _make_middleware(tools=["a"], toon_fallback=False)
+        a, b = self._list(mw, [self._tool("a"), self._tool("b")])
+        assert a.output_schema is None
+        assert b.output_schema == {"type": "object"}
+
+    def test_no_condensing_server_skips_resolution(self, monkeypatch):
+        mw = _make_middleware(condense=False)
+        monkeypatch.setattr(
+            mw, "_resolve_server_config", lambda name: pytest.fail("resolved"),
+        )
+        (tool,) = self._list(mw, [self._tool("a")])
+        assert tool.output_schema == {"type": "object"}
+
+
+class TestOnCallTool:
+    """End-to-end tests of on_call_tool with a stubbed call_next."""
+
+    def _call(self, mw, tool_name, content, structured_content=None):
+        result = ToolResult(content=content, structured_content=structured_content)
+
+        async def call_next(context):
+            return result
+
+        context = SimpleNamespace(message=SimpleNamespace(name=tool_name))
+        return asyncio.run(mw.on_call_tool(context, call_next))
+
+    def test_condenses_text_and_keeps_other_content(self):
+        mw = _make_middleware()
+        text = json.dumps({"items": [{"name": f"item-{i}", "value": i} for i in range(20)]})
+        image = ImageContent(type="image", data="aGVsbG8=", mimeType="image/png")
+        result = self._call(
+            mw, "tool",
+            [TextContent(type="text", text=text), image],
+            structured_content={"items": []},
+        )
+        assert result.content[0].text != text
+        assert result.content[1] is image
+        assert result.structured_content is None
+
+    def test_truncates_each_text_item(self):
+        registry = CollectorRegistry()
+        mw = _make_middleware(
+            metrics=PrometheusRecorder(registry=registry),
+            condense=True, tools=[], toon_fallback=False, max_token_limit=20,
+        )
+        long_text = " ".join(f"word{i}" for i in range(500))
+        result = self._call(mw, "tool", [
+            TextContent(type="text", text=long_text),
+            TextContent(type="text", text="short"),
+        ])
+        assert "[truncated:" in result.content[0].text
+        assert result.content[1].text == "short"
+        assert registry.get_sample_value(
+            "condenser_truncations_total", {"tool": "tool", "server": "default"},
+        ) == 1.0
+
+    def test_short_ascii_text_skips_truncation(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        calls = []
+        monkeypatch.setattr(
+            proxy_mod, "truncate_to_token_limit",
+            lambda text, limit, known=None: calls.append(text) or text,
+        )
+        mw = _make_middleware(tools=[], toon_fallback=False, max_token_limit=100)
+        self._call(mw, "tool", [
+            TextContent(type="text", text="short"),
+            TextContent(type="text", text="ünïcödé"),
+        ])
+        assert calls == ["ünïcödé"]
+
+    def test_multiple_items_tokenized_in_one_batch(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        batches = []
+        real_batch = proxy_mod.count_tokens_batch
+        monkeypatch.setattr(
+            proxy_mod, "count_tokens_batch",
+            lambda texts: batches.append(list(texts)) or real_batch(texts),
+        )
+        monkeypatch.setattr(
+            proxy_mod, "count_tokens",
+            lambda text: pytest.fail("count_tokens called for a batched item"),
+        )
+        mw = _make_middleware(tools=[], toon_fallback=True, min_token_threshold=5)
+        texts = [json.dumps({"rows": [{"a": i, "b": i * 2} for i in range(5)]}), '{"x": 1}']
+        self._call(mw, "tool", [TextContent(type="text", text=t) for t in texts])
+        assert batches == [texts]
+
+    def test_batch_skips_items_decided_without_count(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        batches = []
+        real_batch = proxy_mod.count_tokens_batch
+        monkeypatch.setattr(
+            proxy_mod, "count_tokens_batch",
+            lambda texts: batches.append(list(texts)) or real_batch(texts),
+        )
+        mw = _make_middleware(tools=[], toon_fallback=True, min_token_threshold=10)
+        counted = [
+            json.dumps({"rows": [{"a": i, "b": i * 2} for i in range(5)]}),
+            json.dumps({"rows": [{"c": i} for i in range(5)]}),
+        ]
+        texts = [counted[0], '{"x": 1}', "upstream timed out after 30 seconds", counted[1]]
+        self._call(mw, "tool", [TextContent(type="text", text=t) for t in texts])
+        assert batches == [counted]
+
+    def test_no_batch_without_threshold(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        monkeypatch.setattr(
+            proxy_mod, "count_tokens_batch",
+            lambda texts: pytest.fail("batch used without a threshold"),
+        )
+        mw = _make_middleware(tools=[], toon_fallback=True)
+        self._call(mw, "tool", [
+            TextContent(type="text", text='{"x": 1}'),
+            TextContent(type="text", text='{"y": 2}'),
+        ])
+
+    def test_single_item_not_batched(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        monkeypatch.setattr(
+            proxy_mod, "count_tokens_batch",
+            lambda texts: pytest.fail("batch used for a single item"),
+        )
+        mw = _make_middleware(tools=[], toon_fallback=True)
+        self._call(mw, "tool", [TextContent(type="text", text='{"x": 1}')])
+
+    def test_condensing_runs_off_event_loop_thread(self, monkeypatch):
+        import threading
+
+        mw = _make_middleware(tools=[], toon_fallback=True)
+        threads = []
+        real = mw._process_text_items
+
+        def spy(*args):
+            threads.append(threading.current_thread())
+            return real(*args)
+
+        monkeypatch.setattr(mw, "_process_text_items", spy)
+        self._call(mw, "tool", [TextContent(type="text", text='{"x": 1}')])
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    def test_condensed_token_count_reused_for_truncation(self, monkeypatch):
+        import mcp_condenser.proxy as proxy_mod
+
+        calls = []
+        monkeypatch.setattr(
+            proxy_mod, "truncate_to_token_limit",
+            lambda text, limit, known=None: calls.append(known) or text,
+        )
+        rows = [{"név": f"érték-{i}", "szám": i} for i in range(20)]
+        text = json.dumps({"sor": rows}, ensure_ascii=False)
+        mw = _make_middleware(tools=[], toon_fallback=True, max_token_limit=10_000)
+        result = self._call(mw, "tool", [TextContent(type="text", text=text)])
+        assert result.content[0].text != text
+        assert calls == []
+
+    def test_condense_item_returns_condensed_token_count(self):
+        mw = _make_middleware()
+        text = json.dumps({"items": [{"name": f"item-{i}", "value": i} for i in range(20)]})
+        condensed, _, cond_tokens = mw._condense_item(text, "tool", mw.server_configs["default"])
+        assert cond_tokens == count_tokens(condensed)
+
+    def test_passthrough_tool_stays_on_event_loop_thread(self, monkeypatch):
+        import threading
+
+        mw = _make_middleware(tools=["other"], toon_fallback=False)
+        threads = []
+        real = mw._process_text_items
+        monkeypatch.setattr(
+            mw, "_process_text_items",
+            lambda *a: threads.append(threading.current_thread()) or real(*a),
+        )
+        result = self._call(mw, "tool", [TextContent(type="text", text='{"x": 1}')])
+        assert result.content[0].text == '{"x": 1}'
+        assert threads == [threading.main_thread()]
+
+    def test_tool_resolved_once_per_call(self, monkeypatch):
+        mw = _make_middleware(tools=[], toon_fallback=True)
+        calls = []
+        real = mw._resolve_tool
+        monkeypatch.setattr(
+            mw, "_resolve_tool", lambda *a: calls.append(a[0]) or real(*a),
+        )
+        self._call(mw, "tool", [
+            TextContent(type="text", text='{"x": 1}'),
+            TextContent(type="text", text='{"y": 2}'),
+        ])
+        assert calls == ["tool"]
+
+    def test_condense_disabled_passes_through(self):
+        mw = _make_middleware(condense=False)
+        text = json.dumps({"name": "test"})
+        result = self._call(mw, "tool", [TextContent(type="text", text=text)], {"name": "test"})
+        assert result.content[0].text == text
+        assert result.structured_content == {"name": "test"}
+
+
+class TestConfigureLogging:
+    def test_records_written_by_listener(self, capsys):
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        listener = _configure_logging()
+        try:
+            logging.getLogger("mcp_condenser").info("queued %d", 42)
+        finally:
+            listener.stop()
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+        lines = [l for l in capsys.readouterr().err.splitlines() if "queued" in l]
+        assert len(lines) == 1
+        assert lines[0].endswith("INFO mcp_condenser queued 42")
+
+    def test_repeated_calls_do_not_double_log(self, capsys):
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        listener = _configure_logging()
+        try:
+            assert _configure_logging() is listener
+            logging.getLogger("mcp_condenser").info("once %d", 1)
+        finally:
+            listener.stop()
+            root.handlers[:] = saved_handlers
+            root.setLevel(saved_level)
+        lines = [l for l in capsys.readouterr().err.splitlines() if "once 1" in l]
+        assert len(lines) == 1